@@ -1,9 +1,17 @@
 import serial
 import json
 import time
+import struct
+import sys
 from datetime import datetime
 
 # simple serial monitor
+# python3 debug.py                   print lines from the radio
+# python3 debug.py --capture FILE    also record raw serial data for replay.py
+
+CAPTURE_MAGIC = b'MSCAP1\n'
+# per record: seconds since capture start (monotonic), length of the data
+CAPTURE_RECORD = struct.Struct('<dH')
 
 def load_config():
     with open('config.json') as config_file:
@@ -16,7 +24,40 @@ def find_serial_port(port_list):
             return port
     return None
 
+class CaptureWriter:
+    def __init__(self, path):
+        self._f = open(path, 'wb')
+        self._f.write(CAPTURE_MAGIC)
+        self._start = time.monotonic()
+        self.records = 0
+
+    def write(self, data):
+        offset = time.monotonic() - self._start
+        for i in range(0, len(data), 0xFFFF):
+            chunk = data[i:i + 0xFFFF]
+            self._f.write(CAPTURE_RECORD.pack(offset, len(chunk)))
+            self._f.write(chunk)
+            self.records += 1
+
+    def close(self):
+        self._f.close()
+
+# yields (seconds since capture start, raw bytes)
+def read_capture(path):
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a capture file")
+        while True:
+            header = f.read(CAPTURE_RECORD.size)
+            if len(header) < CAPTURE_RECORD.size:
+                return
+            offset, length = CAPTURE_RECORD.unpack(header)
+            yield offset, f.read(length)
+
 def main():
+    capture = None
+    if len(sys.argv) == 3 and sys.argv[1] == '--capture':
+        capture = CaptureWriter(sys.argv[2])
     config = load_config()
     config_port = config.get('serial', {}).get('port')
     if isinstance(config_port, list):
@@ -33,15 +74,32 @@ def main():
     try:
         with serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1) as ser:
             print(f"{datetime.now()} - Serial output recognized on {SERIAL_PORT}")
+            if capture:
+                print(f"{datetime.now()} - Capturing to {sys.argv[2]}")
+            buffer = b''
             while True:
                 try:
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        print(f"{datetime.now()} | {line}")
+                    data = ser.read(ser.in_waiting or 1)
+                    if not data:
+                        continue
+                    if capture:
+                        capture.write(data)
+                    buffer += data
+                    *lines, buffer = buffer.split(b'\n')
+                    for raw in lines:
+                        line = raw.decode('utf-8', errors='ignore').strip()
+                        if line:
+                            print(f"{datetime.now()} | {line}")
+                except KeyboardInterrupt:
+                    break
                 except Exception as e:
                     time.sleep(1)
     except Exception as e:
         print(f"{datetime.now()} - Error opening serial port: {str(e)}")
+    finally:
+        if capture:
+            capture.close()
+            print(f"{datetime.now()} - {capture.records} records captured.")
 
 if __name__ == "__main__":
     main()
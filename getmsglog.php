@@ -24,7 +24,14 @@ if (file_exists($logfile)) {
     $messages = json_decode(file_get_contents($logfile), true);
     if (!is_array($messages)) $messages = [];
 }
-$messages[] = $json;
+// batched POSTs send a list of entries
+if (array_keys($json) === range(0, count($json) - 1)) {
+    foreach ($json as $entry) {
+        $messages[] = $entry;
+    }
+} else {
+    $messages[] = $json;
+}
 file_put_contents($logfile, json_encode($messages, JSON_UNESCAPED_UNICODE|JSON_PRETTY_PRINT));
 echo json_encode(["status" => "ok"]);
 ?>
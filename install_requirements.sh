@@ -9,10 +9,11 @@ fi
 python3 -m pip install --upgrade pip
 python3 -m pip install \
     pyserial \
+    meshtastic \
     requests \
     beautifulsoup4 \
     feedparser \
-    wikipedia \
+    zstandard \
     googletrans==4.0.0rc1
 
 echo "Installed all requirements."
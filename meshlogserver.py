@@ -0,0 +1,197 @@
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local ingest service for the message log (replaces meshlog.php).
+# Speaks the same protocol as log_json_message: POST a JSON object or a list of
+# objects with the X-API-KEY header. Entries go into an append-only SQLite (WAL)
+# database indexed by sender and time; GET /messages serves paged queries.
+#
+# Usage: python3 meshlogserver.py [--import messages.json]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    received_at TEXT NOT NULL,
+    timestamp TEXT,
+    sender TEXT,
+    msg_id TEXT,
+    text TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_sender_time ON messages (sender, timestamp);
+CREATE INDEX IF NOT EXISTS idx_messages_time ON messages (timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_unique ON messages (sender, msg_id, timestamp);
+"""
+
+MAX_PAGE = 500
+
+def load_config():
+    with open('config.json') as config_file:
+        return json.load(config_file)
+
+class MessageStore:
+    def __init__(self, path):
+        self.path = path
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # one reader connection per server thread, WAL lets them run next to the writer
+    def _reader(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def append(self, entries):
+        now = datetime.now().isoformat()
+        rows = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            rows.append((
+                now,
+                entry.get('timestamp'),
+                entry.get('from'),
+                entry.get('msg_id'),
+                entry.get('text'),
+                json.dumps(entry, ensure_ascii=False),
+            ))
+        with self._write_lock:
+            with self._writer:
+                before = self._writer.total_changes
+                # retried batches are ignored thanks to the unique index
+                self._writer.executemany(
+                    "INSERT OR IGNORE INTO messages (received_at, timestamp, sender, msg_id, text, raw) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                return self._writer.total_changes - before
+
+    # newest first; pass the returned `next` as `before` for the next page
+    def query(self, sender=None, since=None, until=None, before=None, limit=100):
+        clauses = []
+        params = []
+        if sender:
+            clauses.append("sender = ?")
+            params.append(sender)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        if before:
+            clauses.append("id < ?")
+            params.append(int(before))
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        limit = max(1, min(int(limit), MAX_PAGE))
+        rows = self._reader().execute(
+            f"SELECT id, raw FROM messages {where} ORDER BY id DESC LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        messages = [json.loads(row['raw']) for row in rows]
+        next_before = rows[-1]['id'] if len(rows) == limit else None
+        return messages, next_before
+
+def make_handler(store, api_key):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self):
+            if self.headers.get('X-API-KEY') != api_key:
+                self._reply(403, {"error": "Unauthorized"})
+                return False
+            return True
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            length = int(self.headers.get('Content-Length') or 0)
+            data = self.rfile.read(length) if length else b''
+            if not data:
+                self._reply(400, {"error": "No data"})
+                return
+            try:
+                payload = json.loads(data)
+            except ValueError:
+                payload = None
+            if not payload or not isinstance(payload, (dict, list)):
+                self._reply(400, {"error": "Invalid JSON"})
+                return
+            entries = payload if isinstance(payload, list) else [payload]
+            stored = store.append(entries)
+            self._reply(200, {"status": "ok", "stored": stored})
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            url = urlparse(self.path)
+            if url.path.rstrip('/') not in ('/messages', ''):
+                self._reply(404, {"error": "Not found"})
+                return
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                messages, next_before = store.query(
+                    sender=params.get('from'),
+                    since=params.get('since'),
+                    until=params.get('until'),
+                    before=params.get('before'),
+                    limit=params.get('limit', 100),
+                )
+            except ValueError:
+                self._reply(400, {"error": "Invalid query"})
+                return
+            self._reply(200, {"messages": messages, "next": next_before})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+# one-time import of the old messages.json written by meshlog.php
+def import_json_log(store, path):
+    with open(path, encoding='utf-8') as f:
+        messages = json.load(f)
+    if not isinstance(messages, list):
+        messages = []
+    stored = store.append(messages)
+    print(f"{datetime.now()} - Imported {stored} of {len(messages)} messages from {path}")
+
+def main():
+    config = load_config()
+    api_key = config['php']['api_key']
+    server_config = config.get('logserver', {})
+    store = MessageStore(server_config.get('db', 'messages.db'))
+    if len(sys.argv) == 3 and sys.argv[1] == '--import':
+        import_json_log(store, sys.argv[2])
+        return
+    host = server_config.get('host', '127.0.0.1')
+    port = int(server_config.get('port', 8081))
+    server = ThreadingHTTPServer((host, port), make_handler(store, api_key))
+    print(f"{datetime.now()} - Message log server listening on {host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
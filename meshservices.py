@@ -3,6 +3,11 @@ from warnings import showwarning as _showwarning
 
 import time
 import subprocess
+import os
+import sys
+
+# for the startup report (time to first read / first reply)
+PROCESS_STARTED = time.monotonic()
 
 def _filter_ssl_warning(message, category, filename, lineno, file=None, line=None):
     if 'NotOpenSSLWarning' in str(message):
@@ -16,47 +21,357 @@ import json
 import re
 from datetime import datetime
 import requests
+import requests.adapters
 import smtplib
 from email.mime.text import MIMEText
 import glob
 import platform
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 import threading
+import queue
 last_warn_check = None
 
-warned_ids = set()
+# radio connection, opened in main()
+transport = None
+
+# Metrics: counters, histograms and gauges kept in memory, served in the
+# Prometheus text format and summed up in a periodic log line.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Metrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, kind, text):
+        self._help[name] = (kind, text)
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        import bisect
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            idx = bisect.bisect_left(self.buckets, seconds)
+            if idx < len(self.buckets):
+                hist[0][idx] += 1
+            hist[1] += seconds
+            hist[2] += 1
+
+    # fn() returns a number or a dict {label value: number} for `label`
+    def gauge(self, name, fn, label=None, kind='gauge'):
+        with self._lock:
+            self._gauges[name] = (fn, label, kind)
+
+    # a total kept elsewhere (e.g. a queue's drop count), read like a gauge
+    # but exported as a counter
+    def counter(self, name, fn, label=None):
+        self.gauge(name, fn, label, kind='counter')
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            if labels:
+                return self._counters.get(self._key(name, labels), 0)
+            return sum(v for (n, _), v in self._counters.items() if n == name)
+
+    def histogram_totals(self, name):
+        totals = {}
+        with self._lock:
+            for (n, labels), (_, total, count) in self._histograms.items():
+                if n == name:
+                    totals[labels] = (total, count)
+        return totals
+
+    def _gauge_samples(self):
+        with self._lock:
+            gauges = list(self._gauges.items())
+        samples = []
+        for name, (fn, label, kind) in gauges:
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                for label_value, v in value.items():
+                    samples.append((name, ((label, str(label_value)),), v, kind))
+            else:
+                samples.append((name, (), value, kind))
+        return samples
+
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        def escape(v):
+            return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in pairs) + '}'
+
+    def render(self):
+        lines = []
+        seen = set()
+        def header(name, kind):
+            if name in seen:
+                return
+            seen.add(name)
+            kind, text = self._help.get(name, (kind, None))
+            if text:
+                lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._histograms.items())
+        for (name, labels), value in counters:
+            header(name, 'counter')
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for (name, labels), (counts, total, count) in histograms:
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{self._format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{self._format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        for name, labels, value, kind in sorted(self._gauge_samples(), key=lambda s: (s[0], s[1])):
+            header(name, kind)
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+        header('meshservices_uptime_seconds', 'gauge')
+        lines.append(f"meshservices_uptime_seconds {time.time() - self.started:.0f}")
+        return '\n'.join(lines) + '\n'
+
+    # one line for the log: service calls, average service time, sends and queues
+    def summary_line(self):
+        calls = self.counter_value('meshservices_service_calls_total')
+        errors = self.counter_value('meshservices_service_errors_total')
+        totals = self.histogram_totals('meshservices_service_seconds').values()
+        count = sum(c for _, c in totals)
+        avg = sum(t for t, _ in totals) / count if count else 0.0
+        sends = self.counter_value('meshservices_send_total')
+        waits = self.histogram_totals('meshservices_outbound_wait_seconds').values()
+        wait_count = sum(c for _, c in waits)
+        avg_wait = sum(t for t, _ in waits) / wait_count if wait_count else 0.0
+        send_failed = self.counter_value('meshservices_send_failures_total')
+        samples = self._gauge_samples()
+        gauges = {name: value for name, labels, value, _ in samples if not labels}
+        outbound_depth = sum(v for name, _, v, _ in samples if name == 'meshservices_outbound_queue_depth')
+        return (f"Stats: {calls} service calls ({errors} errors, avg {avg:.2f}s), "
+                f"{sends} sends ({send_failed} failed, avg queue wait {avg_wait:.1f}s), "
+                f"{self.counter_value('meshservices_serial_read_errors_total')} read errors, "
+                f"{self.counter_value('meshservices_serial_reconnects_total')} reconnects, "
+                f"{self.counter_value('meshservices_ratelimit_rejected_total')} rate limited, "
+                f"{self.counter_value('meshservices_coalesced_total')} coalesced, "
+                f"queues: dispatch {gauges.get('meshservices_dispatch_queue_depth', 0)}, "
+                f"outbound {outbound_depth}, mail {gauges.get('meshservices_mail_queue_depth', 0)}, "
+                f"log {gauges.get('meshservices_log_pending', 0)}")
+
+metrics = Metrics()
+metrics.describe('meshservices_service_calls_total', 'counter', "Service calls run by the dispatcher")
+metrics.describe('meshservices_service_errors_total', 'counter', "Service calls that raised an exception")
+metrics.describe('meshservices_service_seconds', 'histogram', "Run time of service calls")
+metrics.describe('meshservices_dispatch_wait_seconds', 'histogram', "Time service calls waited for a worker")
+metrics.describe('meshservices_send_total', 'counter', "Packets handed to the radio")
+metrics.describe('meshservices_send_failures_total', 'counter', "Packets the radio did not accept after the retry")
+metrics.describe('meshservices_send_retries_total', 'counter', "Send attempts that were retried")
+metrics.describe('meshservices_send_seconds', 'histogram', "Duration of a send call on the transport")
+metrics.describe('meshservices_outbound_wait_seconds', 'histogram', "Time packets waited in the outbound queue, per priority")
+metrics.describe('meshservices_serial_read_errors_total', 'counter', "Errors while reading from the radio")
+metrics.describe('meshservices_serial_reconnects_total', 'counter', "Radio connections opened after the first one")
+metrics.describe('meshservices_duplicates_total', 'counter', "Received packets dropped as duplicates")
+metrics.describe('meshservices_ratelimit_rejected_total', 'counter', "Service requests rejected by the rate limiter")
+metrics.describe('meshservices_translate_skipped_total', 'counter', "Translations skipped because the text is already in the target language")
+metrics.describe('meshservices_wiki_offline_hits_total', 'counter', "@wiki answers from the offline index")
+metrics.describe('meshservices_upstream_calls_total', 'counter', "Upstream lookups started (cache misses that were not coalesced)")
+metrics.describe('meshservices_coalesced_total', 'counter', "Lookups that joined an identical call in flight instead of going upstream")
+# only requests through http_session() are timed; googletrans brings its own
+# httpx client, so @translate is covered by meshservices_translate_batch_seconds
+metrics.describe('meshservices_http_seconds', 'histogram', "HTTP response time (until headers) per host, shared session only")
+metrics.describe('meshservices_http_requests_total', 'counter', "HTTP requests per host and status class, shared session only")
+metrics.describe('meshservices_translate_batch_seconds', 'histogram', "Duration of one translation backend call")
+
+def http_metrics_hook(response, *args, **kwargs):
+    from urllib.parse import urlparse
+    host = urlparse(response.url).hostname or ''
+    metrics.observe('meshservices_http_seconds', response.elapsed.total_seconds(), host=host)
+    metrics.inc('meshservices_http_requests_total', host=host, status=f"{response.status_code // 100}xx")
+
+# queue depths and cache sizes are read when metrics are rendered
+def register_pipeline_gauges():
+    metrics.gauge('meshservices_dispatch_queue_depth', lambda: dispatcher.queue_depth() if dispatcher else None)
+    metrics.counter('meshservices_dispatch_dropped_total', lambda: dispatcher.dropped if dispatcher else None)
+    metrics.counter('meshservices_dispatch_timed_out_total', lambda: dispatcher.timed_out if dispatcher else None)
+    metrics.gauge('meshservices_outbound_queue_depth', lambda: outbound.queue_depth() if outbound else None, label='priority')
+    metrics.counter('meshservices_outbound_dropped_total', lambda: outbound.dropped if outbound else None)
+    metrics.gauge('meshservices_airtime_used_seconds', lambda: outbound.airtime_used() if outbound else None)
+    metrics.gauge('meshservices_mail_queue_depth', lambda: mail_outbox.queue_depth() if mail_outbox else None)
+    metrics.gauge('meshservices_log_pending', lambda: log_shipper.stats()['pending'] if log_shipper else None)
+    metrics.gauge('meshservices_log_spool_bytes', lambda: log_shipper.spool_size() if log_shipper else None)
+    metrics.gauge('meshservices_dispatch_nodes_waiting', lambda: dispatcher.nodes_waiting() if dispatcher else None)
+    metrics.gauge('meshservices_ratelimit_buckets', lambda: rate_limiter.stats()['buckets'] if rate_limiter else None)
+    metrics.gauge('meshservices_ratelimit_limited_nodes', lambda: rate_limiter.stats()['limited_nodes'] if rate_limiter else None)
+    metrics.gauge('meshservices_radio_connected', lambda: {port: int(link.connected) for port, link in radios.items()}, label='radio')
+    metrics.counter('meshservices_radio_connects_total', lambda: {port: link.connects for port, link in radios.items()}, label='radio')
+    metrics.counter('meshservices_radio_packets_total', lambda: {port: link.packets for port, link in radios.items()}, label='radio')
+    metrics.gauge('meshservices_radio_last_packet_age_seconds',
+                  lambda: {port: round(time.time() - link.last_packet) for port, link in radios.items() if link.last_packet}, label='radio')
+    metrics.gauge('meshservices_airtime_used_by_radio_seconds',
+                  lambda: {port: outbound.airtime_used(link.transport.port) for port, link in radios.items() if link.transport} if outbound else None, label='radio')
+    metrics.gauge('meshservices_startup_seconds', lambda: dict(_startup_marks), label='phase')
+    metrics.counter('meshservices_translate_requests_total', lambda: _translator.requests if _translator else None)
+    metrics.counter('meshservices_translate_batches_total', lambda: _translator.batches if _translator else None)
+    metrics.gauge('meshservices_dedup_entries', lambda: len(packet_dedup) if packet_dedup is not None else None)
+    metrics.gauge('meshservices_cache_entries', lambda: response_cache.stats()['entries'] if response_cache else None)
+    metrics.counter('meshservices_cache_hits_total', lambda: response_cache.stats()['hits'] if response_cache else None, label='service')
+    metrics.counter('meshservices_cache_misses_total', lambda: response_cache.stats()['misses'] if response_cache else None, label='service')
+
+def start_metrics_server(host, port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0].rstrip('/') not in ('/metrics', ''):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"{datetime.now()} - Metrics available on http://{host}:{port}/metrics")
+    return server
+
+def metrics_summary_loop():
+    while True:
+        interval = load_config().get('metrics', {}).get('summaryInterval', 300)
+        if not interval:
+            time.sleep(60)
+            continue
+        time.sleep(interval)
+        print(f"{datetime.now()} - {metrics.summary_line()}")
+        for port, link in list(radios.items()):
+            print(f"{datetime.now()} - {radio_summary_line(port, link.health())}")
+
+def radio_summary_line(port, health):
+    state = f"up on {health['device']} ({health['transport']})" if health['connected'] else "down"
+    line = (f"Radio {port}: {state}, {health['packets']} packets, "
+            f"{health['connects']} connects, {health['read_errors']} read errors")
+    if health['last_error']:
+        line += f", last error: {health['last_error']}"
+    return line
+
+
+# human readable changes between two radar configs
+def radar_config_diff(old, new):
+    changes = []
+    for name in sorted(set(old) | set(new)):
+        if name not in old:
+            changes.append(f"+{name}")
+        elif name not in new:
+            changes.append(f"-{name}")
+        else:
+            for key in sorted(set(old[name]) | set(new[name])):
+                if old[name].get(key) != new[name].get(key):
+                    changes.append(f"{name}.{key}: {old[name].get(key)!r} -> {new[name].get(key)!r}")
+    return changes
 
+# Fetch radarconfig.json from radarConfigUpdateUrl with conditional GETs and
+# apply it in memory (and on disk, atomically) only when it is valid and changed.
 def update_radar_config_loop():
+    etag = None
+    modified = None
     while True:
         try:
             config = load_config()
             url = config.get('radarConfigUpdateUrl')
             if url:
-                resp = requests.get(url, timeout=20)
+                headers = {}
+                if etag:
+                    headers['If-None-Match'] = etag
+                if modified:
+                    headers['If-Modified-Since'] = modified
+                resp = http_session().get(url, timeout=20, headers=headers)
                 if resp.status_code == 200:
-                    with open('radarconfig.json', 'w', encoding='utf-8') as f:
-                        f.write(resp.text)
-        except Exception:
-            pass
+                    new_config = json.loads(resp.text)
+                    validate_radar_settings(new_config)
+                    try:
+                        old_config = load_radar_config()
+                    except Exception:
+                        old_config = {}
+                    if new_config != old_config:
+                        RADAR_CONFIG.replace(new_config, raw=resp.text)
+                        print(f"{datetime.now()} - Radar config updated: {', '.join(radar_config_diff(old_config, new_config))}")
+                    etag = resp.headers.get('ETag')
+                    modified = resp.headers.get('Last-Modified')
+                elif resp.status_code != 304:
+                    print(f"{datetime.now()} - Radar config update failed: {resp.status_code}")
+        except Exception as e:
+            print(f"{datetime.now()} - Rejected radar config update: {str(e)}")
         time.sleep(60)
 
-def fetch_dwd_warnings():
-    try:
-        config = load_config()
-        warnings_config = config.get('warnings', {})
+# Shared poller for the DWD and MoWaS feeds: both are fetched in parallel with
+# conditional GETs, filtered once for the configured region and published as a
+# snapshot that @warn and the background loop read from.
+DWD_WARNINGS_URL = "https://warnung.bund.de/bbk.dwd/unwetter.json"
+MOWAS_WARNINGS_URL = "https://warnung.bund.de/bbk.mowas/gefahrendurchsagen.json"
+
+class WarningsPoller:
+    def __init__(self):
+        self._feeds = {
+            'dwd': {'url': DWD_WARNINGS_URL, 'etag': None, 'modified': None, 'data': None},
+            'mowas': {'url': MOWAS_WARNINGS_URL, 'etag': None, 'modified': None, 'data': None},
+        }
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+
+    def _fetch(self, feed):
+        headers = {}
+        if feed['etag']:
+            headers['If-None-Match'] = feed['etag']
+        if feed['modified']:
+            headers['If-Modified-Since'] = feed['modified']
+        resp = http_session().get(feed['url'], timeout=10, headers=headers)
+        if resp.status_code == 304 and feed['data'] is not None:
+            return feed['data']
+        resp.raise_for_status()
+        data = resp.json()
+        feed['etag'] = resp.headers.get('ETag')
+        feed['modified'] = resp.headers.get('Last-Modified')
+        feed['data'] = data
+        return data
+
+    @staticmethod
+    def _filter(dwd_data, mowas_data, warnings_config):
         state_short = warnings_config.get('stateShort', 'BY')
         min_level = warnings_config.get('minLevel', 2)
         region_name = warnings_config.get('regionName', 'Bayern')
-        
-        url = "https://warnung.bund.de/bbk.mowas/gefahrendurchsagen.json"
-        dwd_url = "https://warnung.bund.de/bbk.dwd/unwetter.json"
-        resp = requests.get(dwd_url, timeout=10)
-        data = resp.json()
-        bayern_warnings = [warn for warn in data if warn.get('stateShort') == state_short and warn.get('level', 0) >= min_level]
-        resp2 = requests.get(url, timeout=10)
-        data2 = resp2.json()
+        bayern_warnings = [warn for warn in dwd_data if warn.get('stateShort') == state_short and warn.get('level', 0) >= min_level]
         bayern_cat = []
-        for w in data2:
+        for w in mowas_data:
             if w.get('stateShort') == state_short:
                 bayern_cat.append(w)
             else:
@@ -70,6 +385,92 @@ def fetch_dwd_warnings():
                                 bayern_cat.append(w)
                                 break
         return bayern_warnings, bayern_cat
+
+    def refresh(self):
+        return single_flight.do('warn', '', self._refresh)
+
+    def _refresh(self):
+        with self._refresh_lock:
+            dwd = fetch_pool().submit(self._fetch, self._feeds['dwd'])
+            mowas = fetch_pool().submit(self._fetch, self._feeds['mowas'])
+            warnings_config = load_config().get('warnings', {})
+            self._snapshot = self._filter(dwd.result(), mowas.result(), warnings_config)
+            return self._snapshot
+
+    # current warnings; only goes to the network before the first refresh
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+warnings_poller = WarningsPoller()
+
+# IDs of warnings already sent to the channel, with their expiry, kept on disk
+# so a restart does not re-broadcast every active warning.
+class WarnedIdStore:
+    def __init__(self, path, default_ttl=48 * 3600, grace=3600):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.grace = grace
+        self._ids = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._ids = {k: float(v) for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"{datetime.now()} - Error loading {self.path}: {str(e)}")
+
+    def save(self):
+        with self._lock:
+            data = dict(self._ids)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def __contains__(self, wid):
+        with self._lock:
+            expires = self._ids.get(wid)
+            return expires is not None and expires > time.time()
+
+    def add(self, wid, expires=None):
+        with self._lock:
+            self._ids[wid] = (expires or time.time() + self.default_ttl) + self.grace
+
+    def expire(self):
+        now = time.time()
+        with self._lock:
+            for wid in [wid for wid, expires in self._ids.items() if expires <= now]:
+                del self._ids[wid]
+
+# end of validity of a DWD/MoWaS warning as epoch seconds (None if unknown)
+def warning_expiry(w):
+    candidates = [w.get('expires'), w.get('expiresDate'), w.get('end'), w.get('endDate')]
+    info = w.get('info')
+    if isinstance(info, list) and info and isinstance(info[0], dict):
+        candidates.append(info[0].get('expires'))
+    for value in candidates:
+        if value is None or value == '':
+            continue
+        try:
+            if isinstance(value, (int, float)):
+                return value / 1000 if value > 1e11 else float(value)
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+        except (ValueError, TypeError):
+            continue
+    return None
+
+warned_ids = WarnedIdStore('warned_ids.json')
+
+def fetch_dwd_warnings():
+    try:
+        return warnings_poller.snapshot()
     except Exception as e:
         print(f"{datetime.now()} - Error fetching warnings: {e}")
         return [], []
@@ -96,21 +497,24 @@ def warn_service(message, nodeid, msg_id=None):
         else:
             meldungen.append(f"Katastrophe: Warnung -  []")
     if meldungen:
-        send_message_to_node(nodeid, '\n\n'.join(meldungen))
+        send_message_to_node(nodeid, '\n\n'.join(meldungen), compact=compact_replies())
     else:
         send_message_to_node(nodeid, f"Keine aktuellen Unwetter- oder Katastrophenwarnungen für {region_name}.")
 
 def warn_background_loop():
-    global warned_ids
     while True:
-        bayern_warnings, bayern_cat = fetch_dwd_warnings()
+        try:
+            bayern_warnings, bayern_cat = warnings_poller.refresh()
+        except Exception as e:
+            print(f"{datetime.now()} - Error fetching warnings: {e}")
+            time.sleep(60)
+            continue
+        # (warning id, expiry, text)
         meldungen = []
-        neue_ids = set()
         for w in bayern_warnings:
             wid = w.get('identifier')
             if wid and wid not in warned_ids:
-                meldungen.append(f"[WARN BOT] DWD: {w.get('headline', w.get('event', 'Warnung'))} (Stufe {w.get('level')}) - {w.get('description', '')} [{w.get('stateShort','') or ''}]")
-                neue_ids.add(wid)
+                meldungen.append((wid, warning_expiry(w), f"[WARN BOT] DWD: {w.get('headline', w.get('event', 'Warnung'))} (Stufe {w.get('level')}) - {w.get('description', '')} [{w.get('stateShort','') or ''}]"))
         for w in bayern_cat:
             wid = w.get('identifier')
             if wid and wid not in warned_ids:
@@ -121,81 +525,240 @@ def warn_background_loop():
                     area = ''
                     if 'area' in info[0] and isinstance(info[0]['area'], list) and info[0]['area']:
                         area = info[0]['area'][0].get('areaDesc', '')
-                    meldungen.append(f"[WARN BOT] KAT: {headline} - {desc} [{area}]")
+                    msg = f"[WARN BOT] KAT: {headline} - {desc} [{area}]"
                 else:
-                    meldungen.append(f"[WARN BOT] KAT: Warnung -  []")
-                neue_ids.add(wid)
-        if meldungen:
-            for msg in meldungen:
-                try:
-                    # Send warning to channel 0 - because this may be important
-                    cli_path = get_meshtastic_cli_path()
-                    cmd = f"{cli_path} --ch-index 0 --sendtext '{msg}'"
-                    ser_was_open = False
-                    try:
-                        try:
-                            if ser and ser.is_open:
-                                ser.close()
-                                ser_was_open = True
-                        except Exception:
-                            pass
-                        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=15, stdin=subprocess.DEVNULL)
-                        if result.returncode != 0 or result.stderr:
-                            raise Exception(result.stderr)
-                        print(f"{datetime.now()} - Sent warning to channel: {msg}")
-                    except Exception as e:
-                        print(f"{datetime.now()} - Error on first attempt to send to channel: {str(e)}. Try again with 30 secs.")
-                        try:
-                            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30, stdin=subprocess.DEVNULL)
-                            if result.returncode != 0 or result.stderr:
-                                raise Exception(result.stderr)
-                            print(f"{datetime.now()} - Warning sent to channel on second attempt: {msg}")
-                        except Exception as e2:
-                            print(f"{datetime.now()} - Error on second attempt to send to channel: {str(e2)}")
-                    time.sleep(2)
-                    try:
-                        if ser_was_open and not ser.is_open:
-                            ser.open()
-                            print(f"{datetime.now()} - Serial port reopened.")
-                    except Exception as e:
-                        print(f"{datetime.now()} - Error reopening serial port: {str(e)}")
-                except Exception as e:
-                    print(f"{datetime.now()} - Error sending warning to channel: {e}")
-            warned_ids.update(neue_ids)
-        time.sleep(900)
+                    msg = f"[WARN BOT] KAT: Warnung -  []"
+                meldungen.append((wid, warning_expiry(w), msg))
+        # only warnings that were queued count as sent, the rest are retried
+        for wid, expires, msg in meldungen:
+            if wid in warned_ids:
+                continue
+            # Send warning to channel 0 - because this may be important
+            if send_to_channel(0, msg, priority=PRIO_WARN):
+                print(f"{datetime.now()} - Queued warning for channel: {msg}")
+                warned_ids.add(wid, expires)
+        warned_ids.expire()
+        try:
+            warned_ids.save()
+        except Exception as e:
+            print(f"{datetime.now()} - Error saving warned ids: {str(e)}")
+        time.sleep(load_config().get('warnings', {}).get('interval', 900))
         
+# local message logs by path: rotated, compressed, indexed segments (msglog.py)
+_message_logs = {}
+_message_logs_lock = threading.Lock()
+
+def message_log(log_file):
+    log = _message_logs.get(log_file)
+    if log is None:
+        with _message_logs_lock:
+            log = _message_logs.get(log_file)
+            if log is None:
+                from msglog import MessageLog
+                log = _message_logs[log_file] = MessageLog.from_config(log_file, load_config().get('log', {}).get('rotate', {}))
+    return log
+
 # Log all messages (no service requests)
-def log_json_message(entry, log_file, api_url, api_key):
+def log_json_message(entry, log_file, shipper=None):
     if "timestamp" not in entry or not entry["timestamp"]:
         entry["timestamp"] = datetime.now().isoformat()
     if 'from' in entry and entry['from'].startswith('0x'):
         entry['from'] = '!' + entry['from'][2:]
-    with open(log_file, "a") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    message_log(log_file).append(entry)
     print(f"{datetime.now()} - Logged message: {entry}")
-    try:
-        response = requests.post(
-            api_url,
-            json=entry,
-            headers={"X-API-KEY": api_key}
+    if shipper:
+        shipper.enqueue(entry)
+
+# Pushes logged messages to the log API in the background: batched POSTs over a
+# keep-alive session, retry with backoff, and a spool file for everything that
+# could not be sent (or did not fit into memory) so it survives restarts.
+class LogShipper:
+    def __init__(self, api_url, api_key, spool_file='logspool.jsonl', batch_size=50, max_memory=1000, max_spool_bytes=50 * 1024 * 1024, max_backoff=300):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.spool_file = spool_file
+        self.batch_size = batch_size
+        self.max_memory = max_memory
+        self.max_spool_bytes = max_spool_bytes
+        self.max_backoff = max_backoff
+        self._pending = []
+        self._cond = threading.Condition()
+        self._spool_lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers.update({"X-API-KEY": api_key})
+        self._backoff = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_error = None
+
+    @classmethod
+    def from_config(cls, log_config):
+        return cls(
+            log_config['api_url'],
+            log_config['api_key'],
+            spool_file=log_config.get('spoolFile', 'logspool.jsonl'),
+            batch_size=log_config.get('batchSize', 50),
+            max_memory=log_config.get('maxMemory', 1000),
+            max_spool_bytes=log_config.get('maxSpoolBytes', 50 * 1024 * 1024),
         )
-        if response.status_code == 200:
-            print(f"{datetime.now()} - Successfully pushed to server.")
-        else:
-            print(f"{datetime.now()} - Error on POST: {response.status_code} {response.text}")
-    except Exception as e:
-        print(f"{datetime.now()} - Error on POST: {str(e)}")
 
-# Service @mail (not functional for now)
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def enqueue(self, entry):
+        with self._cond:
+            if len(self._pending) < self.max_memory:
+                self._pending.append(entry)
+                self._cond.notify()
+                return
+        self._spool([entry])
+
+    def spool_size(self):
+        try:
+            return os.path.getsize(self.spool_file)
+        except OSError:
+            return 0
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'spool_bytes': self.spool_size(),
+            'sent': self.sent,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'last_error': self.last_error,
+        }
+
+    def _spool(self, entries):
+        with self._spool_lock:
+            if self.spool_size() >= self.max_spool_bytes:
+                self.dropped += len(entries)
+                print(f"{datetime.now()} - Log spool full, dropped {len(entries)} entries.")
+                return
+            with open(self.spool_file, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _post(self, batch):
+        try:
+            response = self._session.post(self.api_url, json=batch, timeout=(5, 20))
+            if response.status_code == 200:
+                self.sent += len(batch)
+                return True
+            self.last_error = f"{response.status_code} {response.text}"
+        except Exception as e:
+            self.last_error = str(e)
+        self.failed += 1
+        print(f"{datetime.now()} - Error on POST: {self.last_error}")
+        return False
+
+    # byte offset of the spool up to which entries were shipped; kept in a
+    # small file so a restart does not ship them again
+    def _load_offset(self):
+        try:
+            with open(self.spool_file + '.offset', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _save_offset(self, offset):
+        tmp = self.spool_file + '.offset.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(str(offset))
+        os.replace(tmp, self.spool_file + '.offset')
+
+    # next batch_size complete lines from offset; (lines, new offset)
+    def _read_spool(self, offset):
+        lines = []
+        with self._spool_lock:
+            with open(self.spool_file, 'rb') as f:
+                f.seek(offset)
+                while len(lines) < self.batch_size:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        break
+                    lines.append(line)
+                    offset = f.tell()
+        return lines, offset
+
+    # afterwards only the unsent rest is kept, copied without loading it
+    def _compact_spool(self, offset):
+        import shutil
+        with self._spool_lock:
+            if offset >= self.spool_size():
+                os.remove(self.spool_file)
+            elif offset:
+                tmp = self.spool_file + '.tmp'
+                with open(self.spool_file, 'rb') as src, open(tmp, 'wb') as dst:
+                    src.seek(offset)
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp, self.spool_file)
+            try:
+                os.remove(self.spool_file + '.offset')
+            except FileNotFoundError:
+                pass
+
+    # send spooled entries oldest first, batch_size lines at a time
+    def _drain_spool(self):
+        if not os.path.exists(self.spool_file):
+            return True
+        offset = self._load_offset()
+        sent = 0
+        ok = True
+        while True:
+            lines, next_offset = self._read_spool(offset)
+            if not lines:
+                break
+            batch = []
+            for line in lines:
+                try:
+                    batch.append(json.loads(line))
+                except ValueError:
+                    pass
+            if batch and not self._post(batch):
+                ok = False
+                break
+            offset = next_offset
+            sent += len(lines)
+            self._save_offset(offset)
+        self._compact_spool(offset)
+        if sent:
+            print(f"{datetime.now()} - Pushed {sent} spooled log entries to server.")
+        return ok
+
+    def _run(self):
+        while True:
+            if self._backoff:
+                time.sleep(self._backoff)
+            if self.spool_size() and not self._drain_spool():
+                self._backoff = min(max(self._backoff * 2, 5), self.max_backoff)
+                continue
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(timeout=30)
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            if not batch:
+                self._backoff = 0
+                continue
+            if self._post(batch):
+                self._backoff = 0
+                print(f"{datetime.now()} - Successfully pushed {len(batch)} entries to server.")
+            else:
+                self._spool(batch)
+                self._backoff = min(max(self._backoff * 2, 5), self.max_backoff)
+
+log_shipper = None
+
+# Service @mail
 def mail_service(message, nodeid, msg_id=None):
     import re
     if nodeid.startswith('0x'):
         nodeid = '!' + nodeid[2:]
     mail_config = load_config().get('mail', {})
-    SMTP_SERVER = mail_config['smtp']['server']
-    SMTP_PORT = mail_config['smtp']['port']
-    SMTP_USER = mail_config['smtp']['user']
-    SMTP_PASSWORD = mail_config['smtp']['password']
     DEFAULT_SENDER_NAME = mail_config.get('default_sender', 'Mesh-Service')
     LOG_FILE = "meshmail.log"
     def log_message(message):
@@ -229,22 +792,16 @@ def mail_service(message, nodeid, msg_id=None):
     sender_name = fields.get('from')
     content = fields.get('content')
     if recipient and subject and content:
-        msg = MIMEText(content)
-        msg['Subject'] = subject
-        msg['From'] = f"{sender_name} <{SMTP_USER}>" if sender_name else f"{DEFAULT_SENDER_NAME} <{SMTP_USER}>"
-        msg['To'] = recipient
-        try:
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USER, SMTP_PASSWORD)
-                server.send_message(msg)
-            log_message(f"Sent Mail successfully! {recipient}, Subject: {subject}, Content: {content}")
-            print(f"{datetime.now()} - Sent Mail successfully! {recipient}")
-            send_message_to_node(nodeid, "Mail erfolgreich gesendet!")
-        except Exception as e:
-            log_message(f"Error while sending mail: {str(e)}")
-            print(f"{datetime.now()} - Error while sending mail: {str(e)}")
-            send_message_to_node(nodeid, f"Fehler beim Senden der Mail: {e}")
+        radio = current_radio()
+        def on_result(ok, error):
+            if ok:
+                log_message(f"Sent Mail successfully! {recipient}, Subject: {subject}, Content: {content}")
+                print(f"{datetime.now()} - Sent Mail successfully! {recipient}")
+                send_message_to_node(nodeid, "Mail erfolgreich gesendet!", radio=radio)
+            else:
+                log_message(f"Error while sending mail: {str(error)}")
+                send_message_to_node(nodeid, f"Fehler beim Senden der Mail: {error}", radio=radio)
+        mail_outbox.enqueue(recipient, subject, content, sender_name=sender_name or DEFAULT_SENDER_NAME, on_result=on_result)
     else:
         fehlende = []
         if not recipient:
@@ -264,9 +821,253 @@ def mail_service(message, nodeid, msg_id=None):
         print(f"{datetime.now()} - Mail message invalid: {message} (NodeID: {nodeid})")
         send_message_to_node(nodeid, help_text)
 
+# Mail outbox: one background sender keeps an authenticated SMTP connection
+# open (closed after mail.outbox.idleTimeout). A radar alert goes out at once;
+# further alerts to the same recipient within mail.outbox.digestWindow of it
+# are sent together as one digest mail. Queued mails are kept in a spool file
+# until they are delivered or given up: a 5xx reply other than a failed login
+# is final, anything else is retried with a per-mail backoff (mails behind a
+# failing one are not held up). A mail the server keeps refusing with 4xx
+# replies is dropped after maxAttempts refusals; login and connection errors
+# concern every mail and only count against maxAge.
+class MailOutbox:
+    def __init__(self, spool_file='mailspool.json', idle_timeout=60, digest_window=30, max_backoff=600,
+                 max_attempts=10, max_age=2 * 86400):
+        self.spool_file = spool_file
+        self.idle_timeout = idle_timeout
+        self.digest_window = digest_window
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.max_age = max_age
+        self._items = []
+        self._callbacks = {}
+        self._cond = threading.Condition()
+        self._smtp = None
+        self._last_used = 0
+        self._last_radar = {}
+        self.sent = 0
+        self.failed = 0
+        self._load()
+
+    @classmethod
+    def from_config(cls, outbox_config):
+        return cls(
+            spool_file=outbox_config.get('spoolFile', 'mailspool.json'),
+            idle_timeout=outbox_config.get('idleTimeout', 60),
+            digest_window=outbox_config.get('digestWindow', 30),
+            max_attempts=outbox_config.get('maxAttempts', 10),
+            max_age=outbox_config.get('maxAge', 2 * 86400),
+        )
+
+    def _load(self):
+        try:
+            with open(self.spool_file, encoding='utf-8') as f:
+                self._items = json.load(f)
+            if self._items:
+                print(f"{datetime.now()} - {len(self._items)} unsent mails loaded from {self.spool_file}.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"{datetime.now()} - Error loading mail spool: {str(e)}")
+
+    # caller holds self._cond
+    def _save(self):
+        tmp = self.spool_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._items, f, ensure_ascii=False)
+        os.replace(tmp, self.spool_file)
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    # kind 'radar' mails are coalesced per recipient; on_result(ok, error) is
+    # called after delivery (not kept across restarts)
+    def enqueue(self, to, subject, content, sender_name=None, kind='mail', on_result=None):
+        import uuid
+        item = {
+            'id': uuid.uuid4().hex,
+            'to': to,
+            'subject': subject,
+            'content': content,
+            'sender_name': sender_name,
+            'kind': kind,
+            'queued_at': time.time(),
+        }
+        with self._cond:
+            self._items.append(item)
+            if on_result:
+                self._callbacks[item['id']] = on_result
+            try:
+                self._save()
+            except Exception as e:
+                print(f"{datetime.now()} - Error saving mail spool: {str(e)}")
+            self._cond.notify()
+        return item['id']
+
+    def queue_depth(self):
+        with self._cond:
+            return len(self._items)
+
+    # caller holds self._cond; returns (batch, seconds to wait)
+    def _next_batch(self):
+        now = time.time()
+        wait = None
+        for item in self._items:
+            ready_at = item.get('retry_at', 0)
+            if item['kind'] == 'radar':
+                ready_at = max(ready_at, self._last_radar.get(item['to'], 0) + self.digest_window)
+            if ready_at > now:
+                wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                continue
+            if item['kind'] != 'radar':
+                return [item], 0
+            return [i for i in self._items if i['kind'] == 'radar' and i['to'] == item['to']
+                    and i.get('retry_at', 0) <= now], 0
+        return None, wait
+
+    @staticmethod
+    def _build_message(batch, smtp_user, default_sender):
+        first = batch[0]
+        if len(batch) == 1:
+            subject = first['subject']
+            content = first['content']
+        else:
+            subject = f"{len(batch)} radar alerts: " + ', '.join(sorted({i['subject'] for i in batch}))
+            content = '\n\n---\n\n'.join(i['content'] for i in batch)
+        msg = MIMEText(content)
+        msg['Subject'] = subject
+        msg['From'] = f"{first['sender_name'] or default_sender} <{smtp_user}>"
+        msg['To'] = first['to']
+        return msg
+
+    def _connect(self, smtp_config):
+        port = int(smtp_config['port'])
+        if port == 465:
+            server = smtplib.SMTP_SSL(smtp_config['server'], port, timeout=30)
+        else:
+            server = smtplib.SMTP(smtp_config['server'], port, timeout=30)
+            if smtp_config.get('starttls', True):
+                server.starttls()
+        if smtp_config.get('password'):
+            server.login(smtp_config['user'], smtp_config['password'])
+        return server
+
+    def _close(self):
+        if self._smtp:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+        self._smtp = None
+
+    # reuse the open connection; reconnect once if it went away
+    def _deliver(self, msg, smtp_config):
+        for attempt in range(2):
+            try:
+                if self._smtp is None:
+                    self._smtp = self._connect(smtp_config)
+                elif time.monotonic() - self._last_used > 30:
+                    self._smtp.noop()
+                self._smtp.send_message(msg)
+                self._last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused, OSError):
+                self._close()
+                if attempt:
+                    raise
+
+    # delivered or rejected mails leave the spool and report their result once
+    def _finish(self, batch, ok, error=None):
+        with self._cond:
+            ids = {i['id'] for i in batch}
+            self._items = [i for i in self._items if i['id'] not in ids]
+            try:
+                self._save()
+            except Exception as e:
+                print(f"{datetime.now()} - Error saving mail spool: {str(e)}")
+            callbacks = [self._callbacks.pop(i, None) for i in ids]
+        for callback in callbacks:
+            if callback:
+                try:
+                    callback(ok, error)
+                except Exception as e:
+                    print(f"{datetime.now()} - Error in mail callback: {str(e)}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                batch, wait = self._next_batch()
+                if not batch:
+                    if self._smtp and time.monotonic() - self._last_used > self.idle_timeout:
+                        self._close()
+                    self._cond.wait(timeout=min(wait or self.idle_timeout, self.idle_timeout))
+                    continue
+            mail_config = load_config().get('mail', {})
+            try:
+                msg = self._build_message(batch, mail_config['smtp']['user'], mail_config.get('default_sender', 'Mesh-Service'))
+                self._deliver(msg, mail_config['smtp'])
+                self.sent += 1
+                if batch[0]['kind'] == 'radar':
+                    self._last_radar[batch[0]['to']] = time.time()
+                print(f"{datetime.now()} - Mail sent to {msg['To']} ({len(batch)} queued mails).")
+                self._finish(batch, True)
+            except Exception as e:
+                self.failed += 1
+                self._close()
+                self._failed(batch, e)
+
+    # rejected recipients and 5xx replies are final, except a failed login
+    # (535), which a fixed password cures
+    @staticmethod
+    def _is_permanent(error):
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return True
+        if isinstance(error, smtplib.SMTPAuthenticationError):
+            return False
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+    def _failed(self, batch, error):
+        now = time.time()
+        permanent = self._is_permanent(error)
+        refused = isinstance(error, smtplib.SMTPResponseException) and not isinstance(error, smtplib.SMTPAuthenticationError)
+        give_up = []
+        with self._cond:
+            for item in batch:
+                item['attempts'] = item.get('attempts', 0) + 1
+                if refused:
+                    item['refusals'] = item.get('refusals', 0) + 1
+                if (permanent or item.get('refusals', 0) >= self.max_attempts
+                        or now - item['queued_at'] > self.max_age):
+                    give_up.append(item)
+                else:
+                    item['retry_at'] = now + min(10 * 2 ** (item['attempts'] - 1), self.max_backoff)
+            try:
+                self._save()
+            except Exception as e:
+                print(f"{datetime.now()} - Error saving mail spool: {str(e)}")
+        if give_up:
+            print(f"{datetime.now()} - Error while sending mail: {str(error)} ({len(give_up)} mails dropped)")
+            self._finish(give_up, False, error)
+        else:
+            print(f"{datetime.now()} - Error while sending mail: {str(error)} (retry in {item['retry_at'] - now:.0f}s)")
+
+mail_outbox = None
+
 # Service @test
 def test_service(message, nodeid, msg_id=None):
     test_text = "Ack test."
+    # reception details, if the transport reports them
+    packet = current_packet()
+    if packet is not None:
+        details = []
+        if packet.snr is not None:
+            details.append(f"SNR {packet.snr:g} dB")
+        if packet.rssi is not None:
+            details.append(f"RSSI {packet.rssi} dBm")
+        if packet.hops is not None:
+            details.append(f"{packet.hops} Hops")
+        if details:
+            test_text += " " + ", ".join(details)
     send_message_to_node(nodeid, test_text)
 
 # Service @wetter
@@ -282,30 +1083,165 @@ def weather_service(message, nodeid, msg_id=None):
         )
         send_message_to_node(nodeid, help_text)
         return
-    location = arg.replace(' ', '+')
-    url = f"https://wttr.in/{location}?format=j1"
+    def fetch():
+        location = arg.replace(' ', '+')
+        url = f"https://wttr.in/{location}?format=j1"
+        response = http_session().get(url, timeout=10)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        current = data['current_condition'][0]
+        weather = data['weather'][0]
+        temp = current['temp_C']
+        feels = current['FeelsLikeC']
+        desc = current['weatherDesc'][0]['value']
+        wind = current['windspeedKmph']
+        humidity = current['humidity']
+        rain = weather['hourly'][0]['chanceofrain']
+        return (
+            f"Wetter für {arg}: {desc}, {temp}°C (gefühlt {feels}°C), "
+            f"Wind: {wind} km/h, Luftfeuchte: {humidity}%, Regenwahrscheinlichkeit: {rain}%"
+        )
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            current = data['current_condition'][0]
-            weather = data['weather'][0]
-            temp = current['temp_C']
-            feels = current['FeelsLikeC']
-            desc = current['weatherDesc'][0]['value']
-            wind = current['windspeedKmph']
-            humidity = current['humidity']
-            rain = weather['hourly'][0]['chanceofrain']
-            msg = (
-                f"Wetter für {arg}: {desc}, {temp}°C (gefühlt {feels}°C), "
-                f"Wind: {wind} km/h, Luftfeuchte: {humidity}%, Regenwahrscheinlichkeit: {rain}%"
-            )
+        msg = cached_lookup('wetter', arg, fetch)
+        if msg:
             send_message_to_node(nodeid, msg)
         else:
             send_message_to_node(nodeid, f"Fehler beim Abrufen des Wetters für {arg}.")
     except Exception as e:
         send_message_to_node(nodeid, f"Fehler beim Abrufen des Wetters: {str(e)}")
 
+# Shared HTTP session with a connection pool, so repeated requests to the same
+# hosts reuse keep-alive connections
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def http_session():
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.hooks['response'].append(http_metrics_hook)
+                _http_session = session
+    return _http_session
+
+_fetch_pool = None
+
+def fetch_pool():
+    global _fetch_pool
+    if _fetch_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        with _http_session_lock:
+            if _fetch_pool is None:
+                _fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='fetch')
+    return _fetch_pool
+
+# Collects the visible text of <p>/<div> elements while the page is still
+# downloading and stops once enough words are there.
+class PageTextExtractor(HTMLParser):
+    SKIP_TAGS = {'script', 'style', 'noscript', 'head', 'title', 'svg'}
+    TEXT_TAGS = {'p', 'div'}
+
+    def __init__(self, max_words):
+        super().__init__(convert_charrefs=True)
+        self.max_words = max_words
+        self.words = []
+        self._skip = 0
+        self._text = 0
+        self._partial = ''
+
+    # data of one text node can arrive in pieces across chunks
+    def flush_text(self):
+        if self._partial:
+            self.words.extend(self._partial.split())
+            self._partial = ''
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.TEXT_TAGS:
+            self._text += 1
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        if tag in self.SKIP_TAGS and self._skip:
+            self._skip -= 1
+        elif tag in self.TEXT_TAGS and self._text:
+            self._text -= 1
+
+    def handle_data(self, data):
+        if self._text and not self._skip and not self.done():
+            self._partial += data
+            words = self._partial.split()
+            if words and not self._partial[-1].isspace():
+                self._partial = words.pop()
+            else:
+                self._partial = ''
+            self.words.extend(words)
+
+    def done(self):
+        return len(self.words) > self.max_words
+
+# whatever the server has sent, at most `size` bytes; iter_content waits for
+# full chunks, which a trickling page can stretch for minutes
+def _read_chunks(page, size=8192):
+    read1 = getattr(page.raw, 'read1', None)
+    if read1 is None:
+        yield from page.iter_content(chunk_size=size)
+        return
+    while True:
+        chunk = read1(size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+# `deadline` is an absolute time.monotonic() value. The download stops once it
+# has passed; a single read waits at most 5 seconds.
+def summarize_page(url, timeout, max_bytes, max_words=10, deadline=None):
+    import codecs
+    if deadline is None:
+        deadline = time.monotonic() + timeout
+    timeout = max(min(timeout, deadline - time.monotonic(), 5), 0.1)
+    with http_session().get(url, timeout=timeout, stream=True, headers={'User-Agent': 'Mozilla/5.0'}) as page:
+        page.raise_for_status()
+        decoder = codecs.getincrementaldecoder(page.encoding or 'utf-8')(errors='ignore')
+        parser = PageTextExtractor(max_words)
+        received = 0
+        for chunk in _read_chunks(page):
+            received += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.done() or received >= max_bytes or time.monotonic() > deadline:
+                break
+    parser.flush_text()
+    words = parser.words
+    return ' '.join(words[:max_words]) + ('...' if len(words) > max_words else '')
+
+# fetch all result pages at once; pages not finished by the deadline are skipped
+def fetch_page_summaries(results, deadline=15, max_bytes=256 * 1024):
+    from concurrent.futures import wait
+    started = time.monotonic()
+    futures = []
+    for title, url in results:
+        print(f"{datetime.now()} - [Google-Service] Loading and summarizing: {title}")
+        futures.append((title, fetch_pool().submit(summarize_page, url, deadline, max_bytes, deadline=started + deadline)))
+    wait([f for _, f in futures], timeout=deadline)
+    antworten = []
+    for title, future in futures:
+        if not future.done():
+            future.cancel()
+            print(f"{datetime.now()} - [Google-Service] Timeout summarizing '{title}' after {time.monotonic() - started:.1f}s")
+            continue
+        try:
+            antworten.append(f"{title}\n{future.result()}")
+        except Exception as e:
+            print(f"{datetime.now()} - [Google-Service] Error summarizing '{title}': {e}")
+    return antworten
+
 # Service @google
 def google_service(message, nodeid, msg_id=None):
     query = message.strip()
@@ -321,7 +1257,8 @@ def google_service(message, nodeid, msg_id=None):
     results = []
     try:
         ddg_url = f'https://duckduckgo.com/html/?q={requests.utils.quote(query)}'
-        resp = requests.get(ddg_url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        resp = http_session().get(ddg_url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(resp.text, 'html.parser')
         links = soup.select('.result__a')
         for a in links[:5]:
@@ -341,20 +1278,12 @@ def google_service(message, nodeid, msg_id=None):
         print(f"{datetime.now()} - [Google-Service] Error during DuckDuckGo search: {str(e)}")
         send_message_to_node(nodeid, f"Fehler bei der DuckDuckGo-Suche: {str(e)}")
         return
-    antworten = []
-    for title, url in results:
-        try:
-            print(f"{datetime.now()} - [Google-Service] Loading and summarizing: {title}")
-            page = requests.get(url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
-            soup = BeautifulSoup(page.text, 'html.parser')
-            texts = soup.find_all(['p', 'div'])
-            text_content = ' '.join([t.get_text(separator=' ', strip=True) for t in texts])
-            words = text_content.split()
-            summary = ' '.join(words[:10]) + ('...' if len(words) > 10 else '')
-            antworten.append(f"{title}\n{summary}")
-        except Exception as e:
-            print(f"{datetime.now()} - [Google-Service] Error summarizing '{title}': {e}")
-            pass
+    google_config = load_config().get('google', {})
+    antworten = fetch_page_summaries(
+        results,
+        deadline=google_config.get('deadline', 15),
+        max_bytes=google_config.get('maxPageBytes', 256 * 1024),
+    )
     if not antworten:
         antworten = ["Keine Suchergebnisse gefunden."]
     antwort = '\n\n'.join(antworten)
@@ -362,71 +1291,839 @@ def google_service(message, nodeid, msg_id=None):
     send_message_to_node(nodeid, antwort)
 
 # Service @news
+# A background refresher polls the configured feeds with conditional GETs and
+# keeps the reply packed into blocks; "@news neu" only sends the headlines that
+# showed up since the node's last @news.
+DEFAULT_NEWS_FEEDS = [{'name': 'Tagesschau', 'url': 'https://www.tagesschau.de/xml/rss2'}]
+
+class NewsDigest:
+    def __init__(self, feeds=None, max_headlines=10, state_file='news_state.json', max_nodes=1000):
+        self.feed_config = feeds or DEFAULT_NEWS_FEEDS
+        self.feeds = [{'name': f.get('name', f['url']), 'url': f['url'], 'etag': None, 'modified': None, 'items': []}
+                      for f in self.feed_config]
+        self.max_headlines = max_headlines
+        self.state_file = state_file
+        self.max_nodes = max_nodes
+        self._seen = {}
+        self._nodes = {}
+        self._text = None
+        self._blocks = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirty = False
+        self.refreshed_at = None
+        self.not_modified = 0
+        self._load()
+
+    @classmethod
+    def from_config(cls, news_config):
+        return cls(
+            feeds=news_config.get('feeds'),
+            max_headlines=news_config.get('maxHeadlines', 10),
+            state_file=news_config.get('stateFile', 'news_state.json'),
+        )
+
+    def _load(self):
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                state = json.load(f)
+            self._seen = {k: float(v) for k, v in state.get('seen', {}).items()}
+            self._nodes = {k: float(v) for k, v in state.get('nodes', {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"{datetime.now()} - Error loading {self.state_file}: {str(e)}")
+
+    def save(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {'seen': dict(self._seen), 'nodes': dict(self._nodes)}
+            self._dirty = False
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_file)
+
+    # False if the feed did not change (304)
+    def _fetch(self, feed):
+        import feedparser
+        headers = {}
+        if feed['etag']:
+            headers['If-None-Match'] = feed['etag']
+        if feed['modified']:
+            headers['If-Modified-Since'] = feed['modified']
+        resp = http_session().get(feed['url'], timeout=10, headers=headers)
+        if resp.status_code == 304:
+            self.not_modified += 1
+            return False
+        resp.raise_for_status()
+        parsed = feedparser.parse(resp.content)
+        items = []
+        for entry in parsed.entries[:self.max_headlines]:
+            title = ' '.join(entry.get('title', '').split())
+            if title:
+                items.append((entry.get('id') or entry.get('link') or title, title))
+        feed['etag'] = resp.headers.get('ETag')
+        feed['modified'] = resp.headers.get('Last-Modified')
+        feed['items'] = items
+        return True
+
+    def refresh(self):
+        return single_flight.do('news', id(self), self._refresh)
+
+    def _refresh(self):
+        with self._refresh_lock:
+            futures = [(feed, fetch_pool().submit(self._fetch, feed)) for feed in self.feeds]
+            changed = False
+            for feed, future in futures:
+                try:
+                    changed = future.result() or changed
+                except Exception as e:
+                    print(f"{datetime.now()} - [News-Service] Error fetching {feed['url']}: {str(e)}")
+            if changed or self._text is None:
+                self._render()
+            self.refreshed_at = time.time()
+
+    def _render(self):
+        now = time.time()
+        with self._lock:
+            current = {item_id for feed in self.feeds for item_id, _ in feed['items']}
+            self._seen = {item_id: self._seen.get(item_id, now) for item_id in current}
+            self._text = self._format(lambda item_id: True)
+            self._blocks = {}
+            self._dirty = True
+
+    def _format(self, include, heading="Aktuelle Nachrichten:"):
+        sections = []
+        for feed in self.feeds:
+            lines = [f"- {title}" for item_id, title in feed['items'] if include(item_id)]
+            if lines:
+                sections.append((feed['name'], lines))
+        if not sections:
+            return None
+        if len(self.feeds) == 1:
+            return heading + "\n" + "\n".join(sections[0][1])
+        return heading + "\n" + "\n\n".join(f"{name}:\n" + "\n".join(lines) for name, lines in sections)
+
+    # the full digest, packed once per payload size / compact setting
+    def blocks(self, max_bytes, compact):
+        with self._lock:
+            key = (max_bytes, compact)
+            if key not in self._blocks and self._text:
+                self._blocks[key] = pack_text(self._text, max_bytes, compact=compact)
+            return self._blocks.get(key)
+
+    def since(self, timestamp):
+        with self._lock:
+            return self._format(lambda item_id: self._seen.get(item_id, 0) > timestamp, "Neue Nachrichten:")
+
+    def last_request(self, nodeid):
+        with self._lock:
+            return self._nodes.get(nodeid)
+
+    def touch(self, nodeid):
+        with self._lock:
+            self._nodes[nodeid] = time.time()
+            if len(self._nodes) > self.max_nodes:
+                oldest = sorted(self._nodes, key=self._nodes.get)[:len(self._nodes) - self.max_nodes]
+                for node in oldest:
+                    del self._nodes[node]
+            self._dirty = True
+
+_news_digest = None
+_news_digest_lock = threading.Lock()
+
+# recreated when the feed list in the config changes
+def news_digest():
+    global _news_digest
+    news_config = load_config().get('news', {})
+    feeds = news_config.get('feeds') or DEFAULT_NEWS_FEEDS
+    if _news_digest is None or _news_digest.feed_config != feeds:
+        with _news_digest_lock:
+            if _news_digest is None or _news_digest.feed_config != feeds:
+                _news_digest = NewsDigest.from_config(news_config)
+    return _news_digest
+
+def news_background_loop():
+    while True:
+        try:
+            if is_service_enabled('news'):
+                digest = news_digest()
+                digest.refresh()
+                digest.save()
+        except Exception as e:
+            print(f"{datetime.now()} - [News-Service] Error refreshing feeds: {str(e)}")
+        time.sleep(load_config().get('news', {}).get('interval', 600))
+
 def news_service(message, nodeid, msg_id=None):
-    import feedparser
+    if nodeid.startswith('0x'):
+        nodeid = '!' + nodeid[2:]
     try:
-        feed_url = "https://www.tagesschau.de/xml/rss2"
-        print(f"{datetime.now()} - [News-Service] Fetching news feed: {feed_url}")
-        feed = feedparser.parse(feed_url)
-        headlines = []
-        for entry in feed.entries[:10]:
-            title = entry.title.strip()
-            headlines.append(f"- {title}")
-        if headlines:
-            nachricht = "Aktuelle Nachrichten:\n" + "\n".join(headlines)
-        else:
-            nachricht = "Keine aktuellen Nachrichten gefunden."
-        print(f"{datetime.now()} - [News-Service] Sending to NodeID {nodeid}: {nachricht}")
-        send_message_to_node(nodeid, nachricht)
+        digest = news_digest()
+        if digest.refreshed_at is None:
+            digest.refresh()
+        last = digest.last_request(nodeid)
+        digest.touch(nodeid)
+        if message.strip().lower() in ('neu', 'new') and last is not None:
+            nachricht = digest.since(last)
+            if not nachricht:
+                send_message_to_node(nodeid, f"Keine neuen Nachrichten seit {datetime.fromtimestamp(last).strftime('%H:%M')}.")
+                return
+            print(f"{datetime.now()} - [News-Service] Sending new headlines to NodeID {nodeid}: {nachricht}")
+            send_message_to_node(nodeid, nachricht, compact=compact_replies())
+            return
+        blocks = digest.blocks(max_payload_bytes(), compact_replies())
+        if not blocks:
+            send_message_to_node(nodeid, "Keine aktuellen Nachrichten gefunden.")
+            return
+        print(f"{datetime.now()} - [News-Service] Sending {len(blocks)} prepacked blocks to NodeID {nodeid}.")
+        send_blocks_to_node(nodeid, blocks)
     except Exception as e:
         print(f"{datetime.now()} - [News-Service] Error: {e}")
         send_message_to_node(nodeid, f"Fehler beim Laden der Nachrichten: {e}")
 
 # Service @wiki
+# REST lookups per language without shared state: the page summary for the
+# exact title, else the first search hit. Languages are queried in parallel.
+WIKI_API = "https://{lang}.wikipedia.org"
+
+def wiki_search(lang, query, limit=1, timeout=8):
+    resp = http_session().get(
+        f"{WIKI_API.format(lang=lang)}/w/api.php",
+        params={'action': 'opensearch', 'search': query, 'limit': limit, 'namespace': 0, 'format': 'json'},
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    return resp.json()[1]
+
+def wiki_page_summary(lang, title, timeout=8):
+    url = f"{WIKI_API.format(lang=lang)}/api/rest_v1/page/summary/{requests.utils.quote(title.replace(' ', '_'), safe='')}"
+    resp = http_session().get(url, timeout=timeout, headers={'Accept': 'application/json'})
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return resp.json()
+
+def wiki_summary(lang, query, sentences=2, timeout=8):
+    from wikiindex import first_sentences
+    page = wiki_page_summary(lang, query, timeout)
+    if page is None:
+        titles = wiki_search(lang, query, timeout=timeout)
+        if not titles:
+            return None
+        page = wiki_page_summary(lang, titles[0], timeout)
+        if page is None:
+            return None
+    if page.get('type') == 'disambiguation':
+        options = [t for t in wiki_search(lang, query, limit=4, timeout=timeout) if t.lower() != query.lower()]
+        return f"Mehrdeutig: {', '.join(options[:3])}" if options else None
+    extract = page.get('extract')
+    return first_sentences(extract, sentences) if extract else None
+
+# first answer in order of preference; a less preferred language only wins if
+# the preferred ones failed or are still running prefer_wait after it answered
+def wiki_lookup(query, languages, deadline=10, prefer_wait=0.5):
+    from concurrent.futures import wait, FIRST_COMPLETED
+    started = time.monotonic()
+    futures = [(lang, fetch_pool().submit(wiki_summary, lang, query, timeout=deadline)) for lang in languages]
+    results = {}
+    answered_at = None
+    while True:
+        best = None
+        preferred_pending = False
+        for lang, future in futures:
+            if not future.done():
+                preferred_pending = True
+                continue
+            if lang not in results:
+                try:
+                    results[lang] = future.result()
+                except Exception as e:
+                    print(f"{datetime.now()} - [Wiki-Service] Error on {lang}.wikipedia.org: {str(e)}")
+                    results[lang] = None
+            if results[lang]:
+                best = results[lang]
+                break
+        if best and not preferred_pending:
+            return best
+        pending = [future for _, future in futures if not future.done()]
+        if not pending:
+            return best
+        now = time.monotonic()
+        if best:
+            answered_at = answered_at or now
+            if now - answered_at >= prefer_wait:
+                return best
+        remaining = started + deadline - now
+        if remaining <= 0:
+            return best
+        wait(pending, timeout=min(remaining, prefer_wait) if best else remaining, return_when=FIRST_COMPLETED)
+
+_wiki_index = None
+_wiki_index_lock = threading.Lock()
+
+def wiki_index():
+    global _wiki_index
+    path = load_config().get('wiki', {}).get('offlineIndex')
+    if not path:
+        return None
+    if _wiki_index is None or _wiki_index.path != path:
+        with _wiki_index_lock:
+            if _wiki_index is None or _wiki_index.path != path:
+                from wikiindex import WikiIndex
+                try:
+                    _wiki_index = WikiIndex(path)
+                    print(f"{datetime.now()} - [Wiki-Service] Offline index {path} with {len(_wiki_index)} articles opened.")
+                except Exception as e:
+                    print(f"{datetime.now()} - [Wiki-Service] Error opening offline index {path}: {str(e)}")
+                    return None
+    return _wiki_index
+
 def wiki_service(message, nodeid, msg_id=None):
-    import wikipedia
     query = message.strip()
     if not query:
         send_message_to_node(nodeid, "Wiki-Service Hilfe: @wiki <Suchbegriff>")
         return
-    for lang in ["de", "en"]:
-        try:
-            wikipedia.set_lang(lang)
-            try:
-                summary = wikipedia.summary(query, sentences=2, auto_suggest=False)
-            except wikipedia.exceptions.PageError:
-                summary = wikipedia.summary(query, sentences=2, auto_suggest=True)
-            send_message_to_node(nodeid, summary)
-            return
-        except wikipedia.exceptions.DisambiguationError as e:
-            vorschlaege = ', '.join(e.options[:3])
-            send_message_to_node(nodeid, f"Mehrdeutig: {vorschlaege}")
-            return
-        except wikipedia.exceptions.PageError:
-            continue
-        except Exception as e:
-            continue
-    send_message_to_node(nodeid, "Kein Wikipedia-Artikel dazu gefunden, sorry.")
+    wiki_config = load_config().get('wiki', {})
+    def fetch():
+        index = wiki_index()
+        if index is not None:
+            summary = index.lookup(query)
+            if summary:
+                metrics.inc('meshservices_wiki_offline_hits_total')
+                return summary
+        return wiki_lookup(
+            query,
+            wiki_config.get('languages', ['de', 'en']),
+            deadline=wiki_config.get('deadline', 10),
+            prefer_wait=wiki_config.get('preferWait', 0.5),
+        )
+    summary = cached_lookup('wiki', query, fetch)
+    send_message_to_node(nodeid, summary or "Kein Wikipedia-Artikel dazu gefunden, sorry.")
 
 # Service @translate
-def translate_service(message, nodeid, msg_id=None):
-    from googletrans import Translator
-    try:
-        parts = message.strip().split(None, 1)
-        if len(parts) < 2:
-            send_message_to_node(nodeid, "Translate-Service Hilfe: @translate <zielsprachcode> <Text>")
-            return
-        lang, text = parts[0], parts[1]
-        translator = Translator()
-        result = translator.translate(text, dest=lang)
-        send_message_to_node(nodeid, result.text)
+# Stop words for a local guess of the source language; texts already in the
+# target language are sent back without calling the backend.
+LANGUAGE_HINTS = {
+    'de': {'der', 'die', 'das', 'und', 'ist', 'nicht', 'ich', 'ein', 'eine', 'zu', 'mit', 'auf', 'für', 'wir', 'sie', 'es', 'du', 'wie', 'heute', 'bitte'},
+    'en': {'the', 'and', 'is', 'not', 'you', 'to', 'of', 'a', 'in', 'it', 'for', 'with', 'we', 'are', 'this', 'that', 'how', 'today', 'please', 'what'},
+    'fr': {'le', 'la', 'les', 'et', 'est', 'pas', 'je', 'un', 'une', 'de', 'des', 'avec', 'pour', 'nous', 'vous', 'il', 'que', 'comment', 'merci'},
+    'es': {'el', 'la', 'los', 'las', 'y', 'es', 'no', 'yo', 'un', 'una', 'de', 'con', 'para', 'que', 'por', 'como', 'hoy', 'gracias'},
+    'it': {'il', 'lo', 'la', 'gli', 'e', 'è', 'non', 'io', 'un', 'una', 'di', 'con', 'per', 'che', 'come', 'oggi', 'grazie'},
+    'nl': {'de', 'het', 'een', 'en', 'is', 'niet', 'ik', 'je', 'van', 'met', 'voor', 'wij', 'zijn', 'dat', 'hoe', 'vandaag', 'alsjeblieft'},
+}
+
+# language code or None when the text is too short or ambiguous
+def detect_language(text, min_hits=2):
+    words = re.findall(r"[^\W\d_]+", text.lower())
+    if len(words) < 3:
+        return None
+    scores = sorted(((sum(w in hints for w in words), lang) for lang, hints in LANGUAGE_HINTS.items()), reverse=True)
+    (best, lang), (second, _) = scores[0], scores[1]
+    if best >= min_hits and best >= 2 * second:
+        return lang
+    return None
+
+# googletrans: one Translator (and HTTP client) for the process; newer
+# releases are async and get their own event loop. googletrans has no batch
+# endpoint - a list is translated with one request per text - so batching
+# only saves upstream calls with LibreTranslate.
+class GoogleTransBackend:
+    name = 'googletrans'
+
+    def __init__(self):
+        from googletrans import Translator
+        self._translator = Translator()
+        self._loop = None
+
+    def _run(self, result):
+        import inspect
+        if not inspect.isawaitable(result):
+            return result
+        import asyncio
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(result)
+
+    # creating the Translator imports googletrans and builds its httpx client;
+    # that client connects on the first translation, there is no request
+    # worth sending ahead of it
+    def warm_up(self):
+        pass
+
+    def translate_batch(self, texts, dest):
+        results = self._run(self._translator.translate(list(texts), dest=dest))
+        return [r.text for r in results]
+
+# LibreTranslate (self-hosted or public), through the shared HTTP session
+class LibreTranslateBackend:
+    name = 'libretranslate'
+
+    def __init__(self, url, api_key=None, timeout=15):
+        self.base_url = url.rstrip('/') + '/'
+        self.url = self.base_url + 'translate'
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def warm_up(self):
+        http_session().head(self.base_url, timeout=5, allow_redirects=False)
+
+    def translate_batch(self, texts, dest):
+        payload = {'q': list(texts), 'source': 'auto', 'target': dest, 'format': 'text'}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        resp = http_session().post(self.url, json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        translated = resp.json()['translatedText']
+        return translated if isinstance(translated, list) else [translated]
+
+TRANSLATION_BACKENDS = {
+    'googletrans': lambda config: GoogleTransBackend(),
+    'libretranslate': lambda config: LibreTranslateBackend(
+        config.get('url', 'https://libretranslate.com'), config.get('apiKey'), config.get('timeout', 15)),
+}
+
+# Collects requests for batchWindow seconds and sends them as one upstream
+# call per target language.
+class TranslationBatcher:
+    def __init__(self, backend, batch_window=0.2, max_batch=16):
+        self.backend = backend
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._pending = []
+        self._cond = threading.Condition()
+        self.batches = 0
+        self.requests = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @classmethod
+    def from_config(cls, translate_config):
+        name = translate_config.get('backend', 'googletrans')
+        if name not in TRANSLATION_BACKENDS:
+            raise ValueError(f"unknown translation backend '{name}'")
+        return cls(
+            TRANSLATION_BACKENDS[name](translate_config),
+            batch_window=translate_config.get('batchWindow', 0.2),
+            max_batch=translate_config.get('maxBatch', 16),
+        )
+
+    def translate(self, text, dest, timeout=30):
+        from concurrent.futures import Future
+        future = Future()
+        with self._cond:
+            self._pending.append((dest, text, future))
+            self.requests += 1
+            self._cond.notify()
+        return future.result(timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.batch_window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            by_dest = {}
+            for dest, text, future in batch:
+                by_dest.setdefault(dest, []).append((text, future))
+            for dest, items in by_dest.items():
+                self.batches += 1
+                started = time.monotonic()
+                try:
+                    results = self.backend.translate_batch([text for text, _ in items], dest)
+                    metrics.observe('meshservices_translate_batch_seconds', time.monotonic() - started, backend=self.backend.name)
+                    if len(results) != len(items):
+                        raise ValueError(f"{self.backend.name} returned {len(results)} translations for {len(items)} texts")
+                    for (_, future), result in zip(items, results):
+                        future.set_result(result)
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+
+_translator = None
+_translator_lock = threading.Lock()
+
+def translator():
+    global _translator
+    if _translator is None:
+        with _translator_lock:
+            if _translator is None:
+                _translator = TranslationBatcher.from_config(load_config().get('translate', {}))
+    return _translator
+
+# builds the configured backend ahead of the first request
+def translate_warm_up():
+    translator().backend.warm_up()
+
+def translate_service(message, nodeid, msg_id=None):
+    try:
+        parts = message.strip().split(None, 1)
+        if len(parts) < 2:
+            send_message_to_node(nodeid, "Translate-Service Hilfe: @translate <zielsprachcode> <Text>")
+            return
+        lang, text = parts[0].lower(), parts[1]
+        if detect_language(text) == lang.split('-')[0]:
+            print(f"{datetime.now()} - [Translate-Service] Text is already in '{lang}', not translated.")
+            metrics.inc('meshservices_translate_skipped_total')
+            send_message_to_node(nodeid, text)
+            return
+        timeout = load_config().get('translate', {}).get('timeout', 30)
+        def fetch():
+            return translator().translate(text, lang, timeout=timeout)
+        send_message_to_node(nodeid, cached_lookup('translate', f"{lang} {text}", fetch))
     except Exception as e:
         send_message_to_node(nodeid, f"Fehler: {e}")
 
+# Response cache for the external lookups (@wetter, @wiki, @translate; @news
+# is served from NewsDigest), keyed by service and normalized query,
+# LRU-bounded with a TTL per service and optionally saved to disk so it
+# survives restarts.
+class ResponseCache:
+    def __init__(self, max_entries=500, ttls=None, default_ttl=600, path=None, save_interval=60):
+        from collections import OrderedDict
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.path = path
+        self.save_interval = save_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = {}
+        self.misses = {}
+
+    @classmethod
+    def from_config(cls, cache_config):
+        return cls(
+            max_entries=cache_config.get('maxEntries', 500),
+            ttls=cache_config.get('ttl', {}),
+            default_ttl=cache_config.get('defaultTtl', 600),
+            path=cache_config.get('file'),
+        )
+
+    # services whose answer depends on the case of the query
+    CASE_SENSITIVE = ('translate',)
+
+    @classmethod
+    def make_key(cls, service, query):
+        query = str(query) if service in cls.CASE_SENSITIVE else str(query).lower()
+        return f"{service}:{' '.join(query.split())}"
+
+    # count=False: a second look that must not change the hit/miss stats
+    def get(self, service, query, count=True):
+        key = self.make_key(service, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                if count:
+                    self.hits[service] = self.hits.get(service, 0) + 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            if count:
+                self.misses[service] = self.misses.get(service, 0) + 1
+            return None
+
+    def put(self, service, query, value):
+        ttl = self.ttls.get(service, self.default_ttl)
+        if not ttl:
+            return
+        key = self.make_key(service, query)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': dict(self.hits), 'misses': dict(self.misses)}
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            now = time.time()
+            with self._lock:
+                for key, expires, value in saved:
+                    if expires > now:
+                        self._entries[key] = (expires, value)
+            print(f"{datetime.now()} - Loaded {len(self._entries)} cached responses from {self.path}.")
+        except Exception as e:
+            print(f"{datetime.now()} - Error loading response cache: {str(e)}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = [[key, expires, value] for key, (expires, value) in self._entries.items()]
+            self._dirty = False
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def start(self):
+        self.load()
+        if self.path:
+            threading.Thread(target=self._save_loop, daemon=True).start()
+
+    def _save_loop(self):
+        while True:
+            time.sleep(self.save_interval)
+            try:
+                self.save()
+            except Exception as e:
+                print(f"{datetime.now()} - Error saving response cache: {str(e)}")
+
+response_cache = None
+
+# Single-flight: concurrent identical lookups share one upstream call and every
+# caller gets its result (or its exception). The result is published before the
+# key is released. A follower waits at most for the rest of its job's timeout
+# and gives up as soon as its job is cancelled.
+class SingleFlight:
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.shared = {}
+
+    def do(self, service, key, fetch):
+        from concurrent.futures import Future
+        with self._lock:
+            future = self._inflight.get((service, key))
+            leader = future is None
+            if leader:
+                future = self._inflight[(service, key)] = Future()
+                self.calls[service] = self.calls.get(service, 0) + 1
+            else:
+                self.shared[service] = self.shared.get(service, 0) + 1
+        if not leader:
+            metrics.inc('meshservices_coalesced_total', service=service)
+            return self._follow(future, service)
+        metrics.inc('meshservices_upstream_calls_total', service=service)
+        try:
+            value = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop((service, key), None)
+        return value
+
+    @staticmethod
+    def _follow(future, service):
+        from concurrent.futures import TimeoutError as FutureTimeout
+        while True:
+            left = job_time_left()
+            try:
+                return future.result(timeout=1 if left is None else max(min(left, 1), 0))
+            except FutureTimeout:
+                if job_cancelled() or (left is not None and left <= 1):
+                    raise TimeoutError(f"gave up waiting for the shared @{service} lookup")
+
+single_flight = SingleFlight()
+
+# returns the cached answer or calls fetch() (once for identical concurrent
+# requests); empty results are not cached. The answer is cached before the
+# in-flight call ends, and a new call looks at the cache once more, so a
+# request arriving just as a call finishes does not go upstream again.
+def cached_lookup(service, query, fetch):
+    if response_cache is not None:
+        value = response_cache.get(service, query)
+        if value is not None:
+            return value
+    def fetch_and_store():
+        if response_cache is not None:
+            value = response_cache.get(service, query, count=False)
+            if value is not None:
+                return value
+        value = fetch()
+        if value and response_cache is not None:
+            response_cache.put(service, query, value)
+        return value
+    return single_flight.do(service, ResponseCache.make_key(service, query), fetch_and_store)
+
+# Config snapshots: each file is parsed and validated once per change. A watcher
+# thread stats the files and swaps in a new snapshot when mtime/inode/size change,
+# so readers never touch the disk. Snapshots are shared - treat them as read-only.
+class ConfigFile:
+    def __init__(self, path, validate=None):
+        self.path = path
+        self.validate = validate
+        self._snapshot = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._pinned = False
+
+    def _stat_signature(self):
+        st = os.stat(self.path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load(self):
+        signature = self._stat_signature()
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+        if self.validate:
+            self.validate(data)
+        return signature, data
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.check()
+            snapshot = self._snapshot
+        return snapshot
+
+    # reload if the file changed; keeps the old snapshot on invalid content
+    def check(self):
+        with self._lock:
+            if self._pinned:
+                return False
+            try:
+                signature = self._stat_signature()
+            except OSError:
+                if self._snapshot is None:
+                    raise
+                return False
+            if signature == self._signature:
+                return False
+            try:
+                signature, data = self._load()
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                self._signature = signature
+                print(f"{datetime.now()} - Invalid {self.path}, keeping previous config: {str(e)}")
+                return False
+            old = self._snapshot
+            self._snapshot = data
+            self._signature = signature
+            if old is not None:
+                print(f"{datetime.now()} - Reloaded {self.path}.")
+        for listener in self._listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                print(f"{datetime.now()} - Error applying {self.path}: {str(e)}")
+        return True
+
+    def on_change(self, listener):
+        self._listeners.append(listener)
+
+    # use `data` instead of the file from now on (replay / tests)
+    def pin(self, data):
+        with self._lock:
+            self._snapshot = data
+            self._pinned = True
+        for listener in self._listeners:
+            listener(data)
+
+    # validate, write via temp file + rename and swap the snapshot right away
+    def replace(self, data, raw=None):
+        if self.validate:
+            self.validate(data)
+        if raw is None:
+            raw = json.dumps(data, ensure_ascii=False, indent=2)
+        with self._lock:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._snapshot = data
+            self._signature = self._stat_signature()
+        for listener in self._listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                print(f"{datetime.now()} - Error applying {self.path}: {str(e)}")
+
+def validate_config(config):
+    if not isinstance(config, dict):
+        raise ValueError("config must be an object")
+    if not isinstance(config.get('serial'), dict) or not config['serial'].get('port'):
+        raise ValueError("serial.port is missing")
+    for section in ('services', 'log', 'mail', 'weather', 'warnings', 'dispatch', 'radar_api_log'):
+        if section in config and not isinstance(config[section], dict):
+            raise ValueError(f"'{section}' must be an object")
+
+def validate_radar_config(radar_config):
+    if not isinstance(radar_config, dict):
+        raise ValueError("radar config must be an object")
+    for name, settings in radar_config.items():
+        if not isinstance(settings, dict):
+            raise ValueError(f"radar '{name}' must be an object")
+
+# strict checks of the radar settings; remote updates must pass them
+def validate_radar_settings(radar_config):
+    validate_radar_config(radar_config)
+    for name, settings in radar_config.items():
+        for key in ('enabled', 'failSafeTrigger', 'rebroadcast'):
+            if key in settings and not isinstance(settings[key], bool):
+                raise ValueError(f"radar '{name}': '{key}' must be true/false")
+        for key in ('name', 'sendEmail'):
+            if key in settings and not isinstance(settings[key], (str, bool)):
+                raise ValueError(f"radar '{name}': '{key}' must be a string")
+        notify = settings.get('notify', True)
+        if not isinstance(notify, (bool, str)):
+            raise ValueError(f"radar '{name}': 'notify' must be true/false or 'HH:MM-HH:MM'")
+        if isinstance(notify, str) and compile_time_range(notify) is None:
+            raise ValueError(f"radar '{name}': invalid notify time range '{notify}'")
+        urls = settings.get('triggerUrls', [])
+        if not isinstance(urls, list) or not all(isinstance(u, str) for u in urls):
+            raise ValueError(f"radar '{name}': 'triggerUrls' must be a list of URLs")
+
+# the local file only needs the structure; existing files with settings the
+# strict check rejects are used as before, with a warning
+def validate_local_radar_config(radar_config):
+    validate_radar_config(radar_config)
+    try:
+        validate_radar_settings(radar_config)
+    except ValueError as e:
+        print(f"{datetime.now()} - Warning: radarconfig.json: {str(e)}")
+
+CONFIG = ConfigFile('config.json', validate_config)
+RADAR_CONFIG = ConfigFile('radarconfig.json', validate_local_radar_config)
+
+def config_watch_loop(interval=2):
+    while True:
+        time.sleep(interval)
+        for config_file in (CONFIG, RADAR_CONFIG):
+            try:
+                config_file.check()
+            except Exception as e:
+                print(f"{datetime.now()} - Error checking {config_file.path}: {str(e)}")
+
 def load_config():
-    with open('config.json') as config_file:
-        config = json.load(config_file)
-        return config
+    return CONFIG.get()
+
+def load_radar_config():
+    return RADAR_CONFIG.get()
 
 def load_services_config():
     config = load_config()
@@ -443,62 +2140,147 @@ def extract_text_message(raw):
         }
     return None
 
+# Radar detection state: fixed-size ring buffers of monotonic timestamps per
+# sensor. Timestamps only ever grow, so lookups are binary searches.
+class TimeRing:
+    def __init__(self, size):
+        self._buf = [0.0] * size
+        self._size = size
+        self._start = 0
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        return self._buf[(self._start + i) % self._size]
+
+    def append(self, ts):
+        if self._len < self._size:
+            self._buf[(self._start + self._len) % self._size] = ts
+            self._len += 1
+        else:
+            self._buf[self._start] = ts
+            self._start = (self._start + 1) % self._size
+
+    # index of the first timestamp >= ts
+    def _lower_bound(self, ts):
+        lo, hi = 0, self._len
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def any_within(self, target, tolerance):
+        i = self._lower_bound(target - tolerance)
+        return i < self._len and self[i] <= target + tolerance
+
+    def count_since(self, ts):
+        return self._len - self._lower_bound(ts)
+
+# "HH:MM-HH:MM" -> (start, end) in seconds of the day, None if invalid
+def compile_time_range(timerange):
+    if not timerange or not isinstance(timerange, str):
+        return None
+    try:
+        start_str, end_str = timerange.split('-')
+        start = datetime.strptime(start_str.strip(), '%H:%M')
+        end = datetime.strptime(end_str.strip(), '%H:%M')
+        return (start.hour * 3600 + start.minute * 60, end.hour * 3600 + end.minute * 60)
+    except Exception:
+        return None
+
+class RadarDetectionEngine:
+    HISTORY = 60
+    # LoRa node-info broadcasts every full hour can trigger the sensor
+    GHOST_HOURS = (1, 2, 3)
+    GHOST_TOLERANCE = 5
+    FAIL_SAFE_WINDOW = 90
+    FAIL_SAFE_COUNT = 2
+    DEFAULT_SETTINGS = {"sendEmail": False, "enabled": True}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._alarms = {}
+        self._detections = {}
+        self._settings = None
+
+    # compile the radar config once per change (notify schedules etc.)
+    def load_settings(self, radar_config):
+        compiled = {}
+        for name, settings in radar_config.items():
+            settings = dict(settings)
+            notify = settings.get("notify", True)
+            settings['_notify_range'] = compile_time_range(notify) if isinstance(notify, str) else None
+            compiled[name] = settings
+        self._settings = compiled
+
+    def settings(self, radar_name):
+        if self._settings is None:
+            self.load_settings(load_radar_config())
+        return self._settings.get(radar_name, self.DEFAULT_SETTINGS)
+
+    @staticmethod
+    def notify_active(settings, now=None):
+        notify = settings.get("notify", True)
+        if not isinstance(notify, str):
+            return bool(notify)
+        window = settings.get('_notify_range')
+        if window is None:
+            return False
+        now = now or datetime.now()
+        seconds = now.hour * 3600 + now.minute * 60 + now.second
+        start, end = window
+        if start <= end:
+            return start <= seconds <= end
+        return seconds >= start or seconds <= end
+
+    # records the alarm; returns the hour offset if it looks like a node-info ghost
+    def register_alarm(self, radar_name, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ring = self._alarms.get(radar_name)
+            if ring is None:
+                ring = self._alarms[radar_name] = TimeRing(self.HISTORY)
+            ghost_hour = None
+            for h in self.GHOST_HOURS:
+                if ring.any_within(now - h * 3600, self.GHOST_TOLERANCE):
+                    ghost_hour = h
+                    break
+            ring.append(now)
+            return ghost_hour
+
+    # fail-safe: count of detections within the window (including this one)
+    def register_detection(self, radar_name, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ring = self._detections.get(radar_name)
+            if ring is None:
+                ring = self._detections[radar_name] = TimeRing(self.HISTORY)
+            ring.append(now)
+            return ring.count_since(now - self.FAIL_SAFE_WINDOW)
+
+radar_engine = RadarDetectionEngine()
+RADAR_CONFIG.on_change(radar_engine.load_settings)
+
 # Service @radar (WIP / please adjust)
 # Usage: Detection Sensor Module Message with @radar xyz
 def radar_service(message, nodeid, msg_id=None):
     cleaned = message.replace('#', '').strip()
     config = load_config()
     radar_channel = config.get('radar_channel_index', 3)
-    def load_radar_config():
-        with open('radarconfig.json') as f:
-            return json.load(f)
-    radar_config = load_radar_config()
-    import re
-    from datetime import datetime
-    def is_time_in_range(timerange):
-        if not timerange or not isinstance(timerange, str):
-            return False
-        try:
-            now = datetime.now().time()
-            start_str, end_str = timerange.split('-')
-            start = datetime.strptime(start_str.strip(), '%H:%M').time()
-            end = datetime.strptime(end_str.strip(), '%H:%M').time()
-            if start <= end:
-                return start <= now <= end
-            else:
-                return now >= start or now <= end
-        except Exception:
-            return False
-    if not hasattr(radar_service, "_detection_times"):
-        radar_service._detection_times = {}
-    if not hasattr(radar_service, "_alarm_times"):
-        radar_service._alarm_times = {}
-    detection_times = radar_service._detection_times
-    alarm_times = radar_service._alarm_times
     parts = cleaned.split()
     radar_name = parts[0] if parts else None
-    now_ts = time.time()
     # LoRa signal too strong and may have triggered radar sensor - this is the fix
     if radar_name:
-        if radar_name not in alarm_times:
-            alarm_times[radar_name] = []
-        ignore_ping = False
-        for h in [1, 2, 3]:
-            target = now_ts - h * 3600
-            for prev in alarm_times[radar_name]:
-                if abs(prev - target) <= 5:
-                    ignore_ping = True
-                    break
-            if ignore_ping:
-                break
-        if ignore_ping:
+        h = radar_engine.register_alarm(radar_name)
+        if h:
             print(f"{datetime.now()} - Radar '{radar_name}': Maybe Node-Info Signal (+/-5s of {h}hrs). Ignoring alarm. LoRa signal too strong and may have triggered radar sensor ;)")
-            alarm_times[radar_name].append(now_ts)
-            alarm_times[radar_name] = alarm_times[radar_name][-60:]
             return
-        alarm_times[radar_name].append(now_ts)
-        alarm_times[radar_name] = alarm_times[radar_name][-60:]
-    radar_settings = radar_config.get(radar_name, {"sendEmail": False, "enabled": True})
+    radar_settings = radar_engine.settings(radar_name)
     trigger_urls = radar_settings.get("triggerUrls", [])
     if not radar_settings.get("enabled", True):
         print(f"{datetime.now()} - Radar '{radar_name}' is disabled via config.")
@@ -507,29 +2289,16 @@ def radar_service(message, nodeid, msg_id=None):
     def radar_display_name():
         return f"{radar_name} ({display_name})" if display_name != radar_name else radar_name
     fail_safe = radar_settings.get("failSafeTrigger", False)
-    allow_trigger = True
     if fail_safe:
-        dta_time = 90
-        dta_count = 2
-        now_ts = time.time()
-        if radar_name not in detection_times:
-            detection_times[radar_name] = []
-        detection_times[radar_name] = [t for t in detection_times[radar_name] if now_ts - t <= dta_time]
-        detection_times[radar_name].append(now_ts)
-        if len(detection_times[radar_name]) < dta_count:
-            allow_trigger = False
-    if not allow_trigger:
-        print(f"{datetime.now()} - Radar '{radar_display_name()}': Not enough detections for failSafeTrigger ({len(detection_times[radar_name])}/2 in 90s).")
-        return
+        detections = radar_engine.register_detection(radar_name)
+        if detections < RadarDetectionEngine.FAIL_SAFE_COUNT:
+            print(f"{datetime.now()} - Radar '{radar_display_name()}': Not enough detections for failSafeTrigger ({detections}/{RadarDetectionEngine.FAIL_SAFE_COUNT} in {RadarDetectionEngine.FAIL_SAFE_WINDOW}s).")
+            return
     if "state:" in cleaned:
         print(f"{datetime.now()} - Radar state info for '{radar_display_name()}' ignored (postStateInfo always false).")
         return
     notify_setting = radar_settings.get("notify", True)
-    notify_active = False
-    if isinstance(notify_setting, str):
-        notify_active = is_time_in_range(notify_setting)
-    else:
-        notify_active = bool(notify_setting)
+    notify_active = RadarDetectionEngine.notify_active(radar_settings)
     mail_to = radar_settings.get("sendEmail", "")
     mail_to = mail_to.strip() if isinstance(mail_to, str) else ""
     send_mail = False
@@ -553,7 +2322,7 @@ def radar_service(message, nodeid, msg_id=None):
                 }
                 if msg_id:
                     payload['messageId'] = msg_id
-                response = requests.post(api_url, data=payload, timeout=10)
+                response = http_session().post(api_url, data=payload, timeout=10)
                 if response.status_code == 200:
                     print(f"{datetime.now()} - [GHOST] Radar API POST sent for {radar_name} ({timestamp}) with label '{label}' (ghost=true)")
                 else:
@@ -577,7 +2346,7 @@ def radar_service(message, nodeid, msg_id=None):
             }
             if msg_id:
                 payload['messageId'] = msg_id
-            response = requests.post(api_url, data=payload, timeout=10)
+            response = http_session().post(api_url, data=payload, timeout=10)
             if response.status_code == 200:
                 print(f"{datetime.now()} - Radar API Log sent for {radar_name} ({timestamp}) with label '{label}'")
             else:
@@ -588,7 +2357,7 @@ def radar_service(message, nodeid, msg_id=None):
     if trigger_urls and notify_active:
         for url in trigger_urls:
             try:
-                threading.Thread(target=lambda u: requests.get(u, timeout=5), args=(url,), daemon=True).start()
+                fetch_pool().submit(http_session().get, url, timeout=5)
                 print(f"{datetime.now()} - TriggerUrl GET request fired: {url}")
             except Exception as e:
                 print(f"{datetime.now()} - Error firing triggerUrl {url}: {str(e)}")
@@ -596,78 +2365,25 @@ def radar_service(message, nodeid, msg_id=None):
     now = datetime.now().strftime('%H:%M:%S')
     cleaned_with_time = f"[{now}] {cleaned} (Radar: {radar_display_name()})"
     if rebroadcast_enabled and notify_active:
-        cli_path = get_meshtastic_cli_path()
-        cmd = f"{cli_path} --ch-index {radar_channel} --sendtext '{cleaned_with_time}'"
-        global ser
-        ser_was_open = False
-        
-        try:
-            try:
-                if ser and ser.is_open:
-                    ser.close()
-                    ser_was_open = True
-                    print(f"{datetime.now()} - Serial port closed for sending (Radar).")
-            except Exception:
-                pass
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=15, stdin=subprocess.DEVNULL)
-            if result.returncode != 0 or result.stderr:
-                raise Exception(result.stderr)
-            print(f"{datetime.now()} - Radar message sent to channel {radar_channel}: {cleaned_with_time}")
-        except Exception as e:
-            print(f"{datetime.now()} - Error on first attempt to send to channel {radar_channel}: {str(e)}. Second attempt with 30s timeout...")
-            try:
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30, stdin=subprocess.DEVNULL)
-                if result.returncode != 0 or result.stderr:
-                    raise Exception(result.stderr)
-                print(f"{datetime.now()} - Radar message sent to channel {radar_channel} on second attempt: {cleaned_with_time}")
-            except Exception as e2:
-                print(f"{datetime.now()} - Error on second attempt to send to channel {radar_channel}: {str(e2)}")
-        time.sleep(2)
-        try:
-            if ser_was_open and not ser.is_open:
-                ser.open()
-                print(f"{datetime.now()} - Serial port reopened.")
-        except Exception as e:
-            print(f"{datetime.now()} - Error reopening serial port: {str(e)}")
+        if send_to_channel(radar_channel, cleaned_with_time, priority=PRIO_RADAR):
+            print(f"{datetime.now()} - Radar message queued for channel {radar_channel}: {cleaned_with_time}")
     else:
         if not rebroadcast_enabled:
             print(f"{datetime.now()} - Radar '{radar_display_name()}': rebroadcast is disabled.")
         if not notify_active:
             print(f"{datetime.now()} - Radar '{radar_display_name()}': notify is not active.")
     if send_mail:
-        mail_config = load_config().get('mail', {})
-        SMTP_SERVER = mail_config['smtp']['server']
-        SMTP_PORT = int(mail_config['smtp']['port'])
-        SMTP_USER = mail_config['smtp']['user']
-        SMTP_PASSWORD = mail_config['smtp']['password']
-        DEFAULT_SENDER_NAME = mail_config.get('default_sender', 'Mesh-Service')
-        from email.mime.text import MIMEText
-        import smtplib
         now_full = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         subject = f"Radar alert from {radar_display_name()}"
         content = f"{cleaned}\n\nRadar: {radar_display_name()}\nTime: {now_full}"
-        msg = MIMEText(content)
-        msg['Subject'] = subject
-        msg['From'] = f"{DEFAULT_SENDER_NAME} <{SMTP_USER}>"
-        msg['To'] = mail_to
-        try:
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USER, SMTP_PASSWORD)
-                server.send_message(msg)
-            print(f"{datetime.now()} - Radar alert mail sent to {mail_to} (Radar: {radar_display_name()})")
-        except Exception as e:
-            print(f"{datetime.now()} - Error sending radar alert mail: {str(e)}")
+        mail_outbox.enqueue(mail_to, subject, content, kind='radar')
+        print(f"{datetime.now()} - Radar alert mail queued for {mail_to} (Radar: {radar_display_name()})")
 
 def ignore_service(message, nodeid, msg_id=None):
     pass
 
 def info_service(message, nodeid, msg_id=None):
-    services_config = load_services_config()
-    enabled = [name for name, active in services_config.items() if active and name in SERVICES and SERVICES[name] and name != 'radar']
-    if not enabled:
-        enabled = [name for name in SERVICES if SERVICES[name] and name != 'radar']
-    enabled.sort()
+    enabled = sorted(name for name in SERVICES.enabled() if name != 'radar')
     msg = "Aktivierte Services:\r" + '\r'.join([f"@{name}" for name in enabled])
     send_message_to_node(nodeid, msg)
 
@@ -676,52 +2392,170 @@ def echo_service(message, nodeid, msg_id=None):
         nodeid = '!' + nodeid[2:]
     msg = message.strip()
     echo_prefix = f"[ECHO/{nodeid}] "
-    max_len = 200
-    allowed_len = max_len - len(echo_prefix)
-    if len(msg) > allowed_len:
-        msg = msg[:allowed_len]
-    echo_msg = echo_prefix + msg
-    cli_path = get_meshtastic_cli_path()
-    cmd = f"{cli_path} --ch-index 0 --sendtext '{echo_msg}'"
-    global ser
-    ser_was_open = False
-    try:
-        try:
-            if ser and ser.is_open:
-                ser.close()
-                ser_was_open = True
-                print(f"{datetime.now()} - Serial port closed for sending (Echo).")
-        except Exception:
-            pass
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=15)
-        if result.returncode != 0 or result.stderr:
-            raise Exception(result.stderr)
-        print(f"{datetime.now()} - Echo message sent to channel 0: {echo_msg}")
-    except Exception as e:
-        print(f"{datetime.now()} - Error sending echo message to channel 0: {str(e)}")
-    time.sleep(2)
-    try:
-        if ser_was_open and not ser.is_open:
-            ser.open()
-            print(f"{datetime.now()} - Serial port reopened.")
-    except Exception as e:
-        print(f"{datetime.now()} - Error reopening serial port: {str(e)}")
-
-SERVICES = {
-    'mail': mail_service,
-    'test': test_service,
-    'wetter': weather_service,
-    'google': google_service,
-    'news': news_service,
-    'wiki': wiki_service,
-    'translate': translate_service,
-    'log': None,
-    'warn': warn_service,
-    'radar': radar_service,
-    'ignore': ignore_service,
-    'echo': echo_service,
-    'info': info_service,
-}
+    echo_msg = truncate_utf8(echo_prefix + msg, max_payload_bytes())
+    if send_to_channel(0, echo_msg, priority=PRIO_ECHO):
+        print(f"{datetime.now()} - Echo message queued for channel 0: {echo_msg}")
+
+# Service registry: built-in services are registered below together with the
+# modules and hosts they need. Plugins come from a package (one module per
+# service, module name = service name, entry function `handle`) or from the
+# 'meshservices.services' entry point group and are only imported when enabled
+# in config['services'].
+# `hosts` are warmed through http_session(); services with their own HTTP
+# client pass a `warmup` callable instead
+class ServiceSpec:
+    __slots__ = ('name', 'handler', 'loader', 'modules', 'hosts', 'builtin', 'warmup')
+
+    def __init__(self, name, handler=None, loader=None, modules=(), hosts=(), builtin=False, warmup=None):
+        self.name = name
+        self.handler = handler
+        self.loader = loader
+        self.modules = tuple(modules)
+        self.hosts = tuple(hosts)
+        self.builtin = builtin
+        self.warmup = warmup
+
+class ServiceRegistry:
+    ENTRY_POINT_GROUP = 'meshservices.services'
+
+    def __init__(self):
+        self._specs = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, handler=None, loader=None, modules=(), hosts=(), builtin=False, warmup=None):
+        self._specs[name] = ServiceSpec(name, handler, loader, modules, hosts, builtin, warmup)
+
+    # finds plugin modules and entry points without importing them
+    def discover(self, package=None, entry_points=True):
+        if package:
+            import importlib.util
+            import pkgutil
+            try:
+                spec = importlib.util.find_spec(package)
+            except (ImportError, ValueError):
+                spec = None
+            if spec is not None and spec.submodule_search_locations:
+                for module in pkgutil.iter_modules(spec.submodule_search_locations):
+                    if module.name.startswith('_') or module.name in self._specs:
+                        continue
+                    module_name = f"{package}.{module.name}"
+                    self.register(module.name, loader=lambda module_name=module_name: importlib.import_module(module_name))
+        if entry_points:
+            import importlib.metadata
+            try:
+                eps = importlib.metadata.entry_points()
+                eps = eps.select(group=self.ENTRY_POINT_GROUP) if hasattr(eps, 'select') else eps.get(self.ENTRY_POINT_GROUP, [])
+            except Exception as e:
+                print(f"{datetime.now()} - Error reading service entry points: {str(e)}")
+                eps = []
+            for ep in eps:
+                if ep.name not in self._specs:
+                    self.register(ep.name, loader=ep.load)
+
+    def _load(self, spec):
+        with self._lock:
+            if spec.handler is None and spec.loader is not None:
+                obj = spec.loader()
+                spec.handler = obj if callable(obj) else getattr(obj, 'handle')
+                spec.modules = tuple(getattr(obj, 'WARMUP_MODULES', spec.modules))
+                spec.hosts = tuple(getattr(obj, 'WARMUP_HOSTS', spec.hosts))
+                spec.warmup = getattr(obj, 'warm_up', spec.warmup)
+                print(f"{datetime.now()} - Loaded service plugin @{spec.name}.")
+        return spec.handler
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(list(self._specs))
+
+    def __getitem__(self, name):
+        return self._load(self._specs[name])
+
+    def is_builtin(self, name):
+        spec = self._specs.get(name)
+        return bool(spec and spec.builtin)
+
+    def enabled(self):
+        return [name for name in self if is_service_enabled(name)]
+
+    # imports the enabled plugins; disabled ones are never imported
+    def load_enabled(self):
+        for name in self.enabled():
+            try:
+                self[name]
+            except Exception as e:
+                print(f"{datetime.now()} - Error loading service @{name}: {str(e)}")
+
+    # imports the modules of the enabled services and opens pooled connections
+    # to their hosts, so the first request does not pay for it
+    def warm_up(self):
+        import importlib
+        started = time.monotonic()
+        modules = set()
+        hosts = set()
+        hooks = []
+        for name in self.enabled():
+            spec = self._specs[name]
+            modules.update(spec.modules)
+            hosts.update(spec.hosts)
+            if spec.warmup:
+                hooks.append((name, spec.warmup))
+        for module in sorted(modules):
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                print(f"{datetime.now()} - Warm-up: could not import {module}: {str(e)}")
+        for url in sorted(hosts):
+            try:
+                http_session().head(url, timeout=5, allow_redirects=False)
+            except Exception as e:
+                print(f"{datetime.now()} - Warm-up: could not connect to {url}: {str(e)}")
+        for name, hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"{datetime.now()} - Warm-up of @{name} failed: {str(e)}")
+        print(f"{datetime.now()} - Warm-up done in {time.monotonic() - started:.2f}s ({len(modules)} modules, {len(hosts)} hosts).")
+        startup_mark('warmup_done')
+
+SERVICES = ServiceRegistry()
+for _name, _handler, _modules, _hosts in [
+    ('mail', mail_service, (), ()),
+    ('test', test_service, (), ()),
+    ('wetter', weather_service, (), ('https://wttr.in/',)),
+    ('google', google_service, ('bs4',), ('https://duckduckgo.com/',)),
+    ('news', news_service, ('feedparser',), ('https://www.tagesschau.de/',)),
+    ('wiki', wiki_service, ('wikiindex',), ('https://de.wikipedia.org/', 'https://en.wikipedia.org/')),
+    ('warn', warn_service, (), ()),
+    ('radar', radar_service, (), ()),
+    ('ignore', ignore_service, (), ()),
+    ('echo', echo_service, (), ()),
+    ('info', info_service, (), ()),
+]:
+    SERVICES.register(_name, _handler, modules=_modules, hosts=_hosts, builtin=True)
+# @translate does not use http_session() with googletrans; it warms whichever
+# backend is configured
+SERVICES.register('translate', translate_service, builtin=True, warmup=translate_warm_up)
+
+_warm_up_started = threading.Event()
+
+def start_warm_up():
+    if _warm_up_started.is_set():
+        return
+    _warm_up_started.set()
+    if load_config().get('plugins', {}).get('warmup', True):
+        threading.Thread(target=SERVICES.warm_up, daemon=True).start()
+
+# time from process start to the first read, packet, reply, ... (logged once)
+_startup_marks = {}
+
+def startup_mark(phase):
+    if phase in _startup_marks:
+        return
+    elapsed = time.monotonic() - PROCESS_STARTED
+    _startup_marks[phase] = elapsed
+    print(f"{datetime.now()} - Startup: {phase.replace('_', ' ')} after {elapsed:.2f}s.")
 
 def find_serial_port(port_list):
     import os
@@ -737,75 +2571,1395 @@ def get_meshtastic_cli_path():
         return cli_path
     return "meshtastic"
 
-def send_message_to_node(nodeid, text):
+# Text message received by a transport, with the radio metadata if the
+# transport knows it (the debug-line parser only has from/id/text)
+class TextPacket:
+    __slots__ = ('from_id', 'msg_id', 'text', 'to', 'channel', 'snr', 'rssi', 'hop_limit', 'hop_start', 'rx_time')
+
+    def __init__(self, from_id, msg_id, text, to=None, channel=None, snr=None, rssi=None, hop_limit=None, hop_start=None, rx_time=None):
+        self.from_id = from_id
+        self.msg_id = msg_id
+        self.text = text
+        self.to = to
+        self.channel = channel
+        self.snr = snr
+        self.rssi = rssi
+        self.hop_limit = hop_limit
+        self.hop_start = hop_start
+        self.rx_time = rx_time
+
+    @property
+    def hops(self):
+        if self.hop_start is None or self.hop_limit is None:
+            return None
+        return self.hop_start - self.hop_limit
+
+    @classmethod
+    def from_msg_data(cls, msg_data):
+        return cls(msg_data['from'], msg_data['msg_id'], msg_data['text'])
+
+    def to_log_entry(self):
+        entry = {"from": self.from_id, "msg_id": self.msg_id, "text": self.text}
+        for key, value in (('channel', self.channel), ('snr', self.snr), ('rssi', self.rssi), ('hops', self.hops)):
+            if value is not None:
+                entry[key] = value
+        return entry
+
+# Radio transports: one long-lived object owns the serial device, reads incoming
+# text messages and sends direct / channel messages over the same connection.
+class RadioTransport:
+    name = 'base'
+
+    def __init__(self, port):
+        self.port = port
+        self._send_lock = threading.Lock()
+
+    # returns a TextPacket or None after timeout
+    def read_message(self, timeout=1):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _send(self, text, dest=None, channel=0, timeout=15):
+        raise NotImplementedError
+
+    def _timed_send(self, kind, text, dest, channel, timeout):
+        started = time.monotonic()
+        try:
+            self._send(text, dest=dest, channel=channel, timeout=timeout)
+        finally:
+            metrics.observe('meshservices_send_seconds', time.monotonic() - started, transport=self.name, kind=kind)
+
+    def _send_with_retry(self, label, text, dest=None, channel=0):
+        kind = 'direct' if dest else 'channel'
+        metrics.inc('meshservices_send_total', transport=self.name, kind=kind)
+        with self._send_lock:
+            try:
+                self._timed_send(kind, text, dest, channel, 15)
+                return True
+            except Exception as e:
+                print(f"{datetime.now()} - Error on first send attempt to {label}: {str(e)}. Second attempt with 30s timeout...")
+            metrics.inc('meshservices_send_retries_total', transport=self.name, kind=kind)
+            try:
+                self._timed_send(kind, text, dest, channel, 30)
+                print(f"{datetime.now()} - Sent to {label} on second attempt.")
+                return True
+            except Exception as e2:
+                print(f"{datetime.now()} - Error on second send attempt to {label}: {str(e2)}")
+                metrics.inc('meshservices_send_failures_total', transport=self.name, kind=kind)
+                return False
+
+    def send_direct(self, nodeid, text):
+        if nodeid.startswith('0x'):
+            nodeid = '!' + nodeid[2:]
+        return self._send_with_retry(f"node {nodeid}", text, dest=nodeid)
+
+    def send_channel(self, index, text):
+        return self._send_with_retry(f"channel {index}", text, channel=int(index))
+
+# In-process Meshtastic API (python meshtastic package), keeps the port open
+class ApiTransport(RadioTransport):
+    name = 'api'
+
+    def __init__(self, port):
+        super().__init__(port)
+        import meshtastic.serial_interface
+        from pubsub import pub
+        self._incoming = queue.Queue()
+        self._lost = threading.Event()
+        self._iface = meshtastic.serial_interface.SerialInterface(devPath=port)
+        pub.subscribe(self._on_text, "meshtastic.receive.text")
+        pub.subscribe(self._on_lost, "meshtastic.connection.lost")
+
+    def _on_text(self, packet, interface):
+        if interface is not self._iface:
+            return
+        try:
+            hop_start = packet.get('hopStart')
+            self._incoming.put(TextPacket(
+                f"0x{packet['from']:x}",
+                f"0x{packet.get('id', 0):x}",
+                packet['decoded']['text'],
+                to=packet.get('to'),
+                channel=packet.get('channel', 0),
+                snr=packet.get('rxSnr') or None,
+                rssi=packet.get('rxRssi') or None,
+                hop_limit=packet.get('hopLimit'),
+                hop_start=hop_start,
+                rx_time=packet.get('rxTime'),
+            ))
+        except Exception as e:
+            print(f"{datetime.now()} - Error parsing packet from radio: {str(e)}")
+
+    def _on_lost(self, interface):
+        if interface is self._iface:
+            self._lost.set()
+
+    def read_message(self, timeout=1):
+        if self._lost.is_set():
+            raise IOError(f"Connection to {self.port} lost")
+        try:
+            return self._incoming.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _send(self, text, dest=None, channel=0, timeout=15):
+        if self._lost.is_set():
+            raise IOError(f"Connection to {self.port} lost")
+        if dest:
+            self._iface.sendText(text, destinationId=dest)
+        else:
+            self._iface.sendText(text, destinationId='^all', channelIndex=channel)
+
+    def close(self):
+        try:
+            from pubsub import pub
+            pub.unsubscribe(self._on_text, "meshtastic.receive.text")
+            pub.unsubscribe(self._on_lost, "meshtastic.connection.lost")
+        except Exception:
+            pass
+        try:
+            self._iface.close()
+        except Exception:
+            pass
+
+# Fallback: parse firmware debug lines with pyserial and send via the meshtastic
+# CLI. The CLI needs the port itself, so it is closed around every send.
+class CliTransport(RadioTransport):
+    name = 'cli'
+    BAUD_RATE = 115200
+
+    def __init__(self, port):
+        super().__init__(port)
+        self._ser = serial.Serial(port, self.BAUD_RATE, timeout=1)
+
+    def read_message(self, timeout=1):
+        with self._send_lock:
+            if not self._ser.is_open:
+                return None
+            line = self._ser.readline().decode('utf-8', errors='ignore').strip()
+        if line and "Received text msg" in line:
+            msg_data = extract_text_message(line)
+            if msg_data:
+                return TextPacket.from_msg_data(msg_data)
+            return None
+        if not line:
+            # port may be closed by a running send
+            time.sleep(0.05)
+        return None
+
+    def _send(self, text, dest=None, channel=0, timeout=15):
+        cmd = [get_meshtastic_cli_path(), '--port', self.port]
+        if dest:
+            cmd += ['--dest', dest]
+        else:
+            cmd += ['--ch-index', str(channel)]
+        cmd += ['--sendtext', text]
+        ser_was_open = False
+        try:
+            if self._ser.is_open:
+                self._ser.close()
+                ser_was_open = True
+        except Exception:
+            pass
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, stdin=subprocess.DEVNULL)
+            if result.returncode != 0 or result.stderr:
+                raise Exception(result.stderr)
+        finally:
+            time.sleep(2)
+            try:
+                if ser_was_open and not self._ser.is_open:
+                    self._ser.open()
+            except Exception as e:
+                print(f"{datetime.now()} - Error reopening serial port: {str(e)}")
+
+    def close(self):
+        try:
+            self._ser.close()
+        except Exception:
+            pass
+
+# Meshtastic serial stream protocol: frames of 0x94 0xC3, 16 bit big-endian
+# length and a protobuf (FromRadio from the device, ToRadio to it). Bytes
+# outside frames are firmware debug output.
+STREAM_START1 = 0x94
+STREAM_START2 = 0xC3
+STREAM_MAX_PAYLOAD = 512
+BROADCAST_NUM = 0xFFFFFFFF
+
+def meshtastic_protobufs():
+    try:
+        from meshtastic.protobuf import mesh_pb2, portnums_pb2
+    except ImportError:
+        from meshtastic import mesh_pb2, portnums_pb2
+    return mesh_pb2, portnums_pb2
+
+class StreamFrameParser:
+    def __init__(self):
+        self._buf = bytearray()
+
+    # returns the payloads of all complete frames; incomplete data stays buffered
+    def feed(self, data):
+        buf = self._buf
+        buf += data
+        frames = []
+        pos = 0
+        end = len(buf)
+        while True:
+            start = buf.find(STREAM_START1, pos)
+            if start < 0 or start + 4 > end:
+                pos = start if start >= 0 else end
+                break
+            if buf[start + 1] != STREAM_START2:
+                pos = start + 1
+                continue
+            length = (buf[start + 2] << 8) | buf[start + 3]
+            if length > STREAM_MAX_PAYLOAD:
+                pos = start + 1
+                continue
+            if start + 4 + length > end:
+                pos = start
+                break
+            frames.append(bytes(memoryview(buf)[start + 4:start + 4 + length]))
+            pos = start + 4 + length
+        del buf[:pos]
+        return frames
+
+def stream_frame(payload):
+    return bytes((STREAM_START1, STREAM_START2, len(payload) >> 8, len(payload) & 0xFF)) + payload
+
+# FromRadio payload -> (TextPacket or None, name of the payload field)
+def decode_from_radio(payload, mesh_pb2, portnums_pb2):
+    from_radio = mesh_pb2.FromRadio.FromString(payload)
+    field = from_radio.WhichOneof('payload_variant')
+    if field != 'packet':
+        return None, field
+    packet = from_radio.packet
+    if packet.WhichOneof('payload_variant') != 'decoded':
+        return None, field
+    if packet.decoded.portnum != portnums_pb2.TEXT_MESSAGE_APP:
+        return None, field
+    return TextPacket(
+        f"0x{getattr(packet, 'from'):x}",
+        f"0x{packet.id:x}",
+        packet.decoded.payload.decode('utf-8', errors='ignore'),
+        to=packet.to,
+        channel=packet.channel,
+        # proto3 fields read 0 when the radio did not set them
+        snr=packet.rx_snr or None,
+        rssi=packet.rx_rssi or None,
+        hop_limit=packet.hop_limit,
+        hop_start=packet.hop_start if packet.hop_start else None,
+        rx_time=packet.rx_time or None,
+    ), field
+
+# Speaks the stream protocol directly on one pyserial connection: bulk reads
+# from the port buffer, frame parsing and protobuf decoding in-process.
+class StreamTransport(RadioTransport):
+    name = 'stream'
+    BAUD_RATE = 115200
+    HEARTBEAT_INTERVAL = 300
+
+    def __init__(self, port):
+        super().__init__(port)
+        import random
+        self._mesh_pb2, self._portnums_pb2 = meshtastic_protobufs()
+        self._random = random.Random()
+        self._ser = serial.Serial(port, self.BAUD_RATE, timeout=0.1)
+        self._parser = StreamFrameParser()
+        self._pending = []
+        self._last_heartbeat = 0
+        self._write_lock = threading.Lock()
+        # wake the device and switch it to API mode
+        self._write(bytes([STREAM_START2]) * 32)
+        time.sleep(0.1)
+        self._want_config()
+
+    def _write(self, data):
+        with self._write_lock:
+            self._ser.write(data)
+            self._ser.flush()
+
+    def _send_to_radio(self, to_radio):
+        self._write(stream_frame(to_radio.SerializeToString()))
+
+    def _want_config(self):
+        to_radio = self._mesh_pb2.ToRadio()
+        to_radio.want_config_id = self._random.randint(1, 0xFFFFFFFF)
+        self._send_to_radio(to_radio)
+        self._last_heartbeat = time.monotonic()
+
+    def _heartbeat(self):
+        to_radio = self._mesh_pb2.ToRadio()
+        to_radio.heartbeat.SetInParent()
+        self._send_to_radio(to_radio)
+        self._last_heartbeat = time.monotonic()
+
+    def _decode(self, payload):
+        packet, field = decode_from_radio(payload, self._mesh_pb2, self._portnums_pb2)
+        if field == 'rebooted':
+            self._want_config()
+        return packet
+
+    def read_message(self, timeout=1):
+        deadline = time.monotonic() + timeout
+        while not self._pending:
+            if time.monotonic() - self._last_heartbeat > self.HEARTBEAT_INTERVAL:
+                self._heartbeat()
+            data = self._ser.read(self._ser.in_waiting or 1)
+            if data:
+                for payload in self._parser.feed(data):
+                    try:
+                        packet = self._decode(payload)
+                    except Exception as e:
+                        print(f"{datetime.now()} - Error decoding frame from radio: {str(e)}")
+                        continue
+                    if packet:
+                        self._pending.append(packet)
+            if time.monotonic() >= deadline:
+                break
+        return self._pending.pop(0) if self._pending else None
+
+    def _send(self, text, dest=None, channel=0, timeout=15):
+        mesh_pb2 = self._mesh_pb2
+        packet = mesh_pb2.MeshPacket()
+        if dest:
+            packet.to = int(dest.lstrip('!'), 16)
+            packet.want_ack = True
+        else:
+            packet.to = BROADCAST_NUM
+            packet.channel = channel
+        packet.id = self._random.randint(1, 0xFFFFFFFF)
+        packet.decoded.portnum = self._portnums_pb2.TEXT_MESSAGE_APP
+        packet.decoded.payload = text.encode('utf-8')
+        to_radio = mesh_pb2.ToRadio()
+        to_radio.packet.CopyFrom(packet)
+        self._send_to_radio(to_radio)
+
+    def close(self):
+        try:
+            self._ser.close()
+        except Exception:
+            pass
+
+TRANSPORTS = {
+    'api': ApiTransport,
+    'stream': StreamTransport,
+    'cli': CliTransport,
+}
+
+def open_transport(port, serial_config):
+    name = serial_config.get('transport', 'api')
+    if name not in TRANSPORTS:
+        print(f"{datetime.now()} - Unknown transport '{name}', using 'api'.")
+        name = 'api'
+    try:
+        return TRANSPORTS[name](port)
+    except ImportError as e:
+        if name == 'cli':
+            raise
+        print(f"{datetime.now()} - Transport '{name}' not available ({str(e)}), falling back to meshtastic CLI.")
+        return CliTransport(port)
+
+# One reader per configured radio: each link opens its device, reads packets
+# and reconnects on its own, so a flaky adapter does not stall the others.
+class RadioLink:
+    # `port` names the radio (replies, budgets, metrics); the device opened is
+    # the first of port and its fallbacks that exists
+    def __init__(self, port, serial_config, fallbacks=()):
+        self.port = port
+        self.candidates = [port] + [p for p in fallbacks if p != port]
+        self.serial_config = serial_config
+        self.device = None
+        self.transport = None
+        self.claimed = False
+        self.connects = 0
+        self.read_errors = 0
+        self.packets = 0
+        self.connected_since = None
+        self.last_packet = None
+        self.last_error = None
+
+    @property
+    def connected(self):
+        return self.transport is not None
+
+    def start(self, log_enabled, log_file):
+        threading.Thread(target=self.run, args=(log_enabled, log_file), daemon=True).start()
+
+    # alternative names for one device (e.g. /dev/serial/by-id/... and
+    # /dev/ttyUSB0) must not be opened twice
+    def _claim_device(self):
+        with _radio_claim_lock:
+            for candidate in self.candidates:
+                if not os.path.exists(candidate):
+                    continue
+                device = os.path.realpath(candidate)
+                if any(link is not self and link.claimed and os.path.realpath(link.device) == device
+                       for link in list(radios.values())):
+                    continue
+                self.device = candidate
+                self.claimed = True
+                return True
+            return False
+
+    def _wait_for_device(self):
+        if self._claim_device():
+            return
+        print(f"{datetime.now()} - No device on serial {', '.join(self.candidates)} found.")
+        while not self._claim_device():
+            time.sleep(5)
+
+    def run(self, log_enabled, log_file):
+        _job_context.radio = self.port
+        while True:
+            self._wait_for_device()
+            try:
+                self.transport = open_transport(self.device, self.serial_config)
+                self.connects += 1
+                if self.connects > 1:
+                    metrics.inc('meshservices_serial_reconnects_total', port=self.port)
+                self.connected_since = time.time()
+                print(f"{datetime.now()} - Radio connected on {self.device} ({self.transport.name}), waiting for messages.")
+                startup_mark('port_open')
+                start_warm_up()
+                while True:
+                    try:
+                        packet = self.transport.read_message(timeout=1)
+                    except Exception as e:
+                        self._read_error(e)
+                        print(f"{datetime.now()} - Error reading from serial port {self.device}: {str(e)}")
+                        break
+                    startup_mark('first_read')
+                    if packet:
+                        startup_mark('first_packet')
+                        self.packets += 1
+                        self.last_packet = time.time()
+                        process_packet(packet, log_enabled, log_file, radio=self.port)
+            except Exception as e:
+                self._read_error(e)
+                print(f"{datetime.now()} - Error opening or reading from serial port {self.device}: {str(e)}")
+            finally:
+                if self.transport:
+                    self.transport.close()
+                self.transport = None
+                self.claimed = False
+                self.connected_since = None
+                print(f"{datetime.now()} - Connection to {self.device} lost or error. Restarting monitoring.")
+                time.sleep(5)
+
+    def _read_error(self, e):
+        self.read_errors += 1
+        self.last_error = str(e)
+        metrics.inc('meshservices_serial_read_errors_total', port=self.port)
+
+    def health(self):
+        return {
+            'connected': self.connected,
+            'device': self.device if self.claimed else None,
+            'transport': self.transport.name if self.transport else None,
+            'connects': self.connects,
+            'read_errors': self.read_errors,
+            'packets': self.packets,
+            'connected_since': self.connected_since,
+            'last_packet': self.last_packet,
+            'last_error': self.last_error,
+        }
+
+# port -> RadioLink, filled in main(); the first configured radio is the default
+radios = {}
+_radio_claim_lock = threading.Lock()
+
+# config: "port": "/dev/ttyUSB0" or a list of ports to try in order (one
+# radio). Several radios need "multiRadio": true (every port in the list is a
+# radio) or a list of {"port": ..., "transport": ...} to override the
+# transport per radio.
+def configured_radios(serial_config):
+    ports = serial_config.get('port')
+    if not isinstance(ports, list):
+        ports = [ports] if ports else []
+    if ports and not serial_config.get('multiRadio', False) and not any(isinstance(e, dict) for e in ports):
+        return [RadioLink(ports[0], serial_config, fallbacks=ports[1:])]
+    links = []
+    for entry in ports:
+        if isinstance(entry, dict):
+            links.append(RadioLink(entry['port'], dict(serial_config, **entry)))
+        else:
+            links.append(RadioLink(entry, serial_config))
+    return links
+
+# transport for a radio port; None picks the default radio (the single
+# transport set by replay/tests, else the first connected radio)
+def transport_for(radio=None):
+    if radio is not None:
+        link = radios.get(radio)
+        if link is not None:
+            return link.transport
+        if transport is not None and transport.port == radio:
+            return transport
+        return None
+    if transport is not None:
+        return transport
+    for link in radios.values():
+        if link.transport is not None:
+            return link.transport
+    return None
+
+# Outbound scheduler: every packet goes through one queue, ordered by priority,
+# paced and limited by an airtime budget (duty cycle over a rolling window).
+# Pacing and budget are kept per radio, so a busy radio does not hold back
+# packets for the others.
+PRIO_WARN = 0
+PRIO_RADAR = 1
+PRIO_REPLY = 2
+PRIO_ECHO = 3
+PRIORITY_NAMES = {PRIO_WARN: 'warn', PRIO_RADAR: 'radar', PRIO_REPLY: 'reply', PRIO_ECHO: 'echo'}
+
+# Meshtastic modem presets: (bandwidth kHz, spreading factor, coding rate 4/x)
+MODEM_PRESETS = {
+    'SHORT_TURBO': (500, 7, 5),
+    'SHORT_FAST': (250, 7, 5),
+    'SHORT_SLOW': (250, 8, 5),
+    'MEDIUM_FAST': (250, 9, 5),
+    'MEDIUM_SLOW': (250, 10, 5),
+    'LONG_FAST': (250, 11, 5),
+    'LONG_MODERATE': (125, 11, 8),
+    'LONG_SLOW': (125, 12, 8),
+    'VERY_LONG_SLOW': (62.5, 12, 8),
+}
+# mesh packet header + Data protobuf around the text
+PACKET_OVERHEAD_BYTES = 16 + 5
+PREAMBLE_SYMBOLS = 16
+
+# LoRa time on air in seconds (Semtech AN1200.13, explicit header, CRC on)
+def estimate_airtime(payload_bytes, preset='LONG_FAST'):
+    import math
+    bw, sf, cr = MODEM_PRESETS.get(preset, MODEM_PRESETS['LONG_FAST'])
+    t_sym = (2 ** sf) / (bw * 1000)
+    de = 1 if t_sym > 0.016 else 0
+    pl = payload_bytes + PACKET_OVERHEAD_BYTES
+    n_payload = 8 + max(math.ceil((8 * pl - 4 * sf + 28 + 16) / (4 * (sf - 2 * de))) * cr, 0)
+    return (PREAMBLE_SYMBOLS + 4.25) * t_sym + n_payload * t_sym
+
+class OutboundItem:
+    def __init__(self, priority, text, nodeid=None, channel=0, radio=None):
+        self.priority = priority
+        self.text = text
+        self.nodeid = nodeid
+        self.channel = channel
+        self.radio = radio
+        self.queued_at = time.monotonic()
+
+    def label(self):
+        target = f"node {self.nodeid}" if self.nodeid else f"channel {self.channel}"
+        return f"{target} via {self.radio}" if self.radio else target
+
+class OutboundScheduler:
+    def __init__(self, preset='LONG_FAST', duty_cycle=10.0, window=3600, min_gap=1.0, max_queue=200, max_age=600):
+        self.preset = preset
+        self.duty_cycle = duty_cycle
+        self.window = window
+        self.min_gap = min_gap
+        self.max_queue = max_queue
+        self.max_age = max_age
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._airtime_log = []
+        self._last_send = {}
+        self.sent = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_config(cls, outbound_config):
+        return cls(
+            preset=outbound_config.get('modemPreset', 'LONG_FAST'),
+            duty_cycle=outbound_config.get('dutyCycle', 10.0),
+            window=outbound_config.get('window', 3600),
+            min_gap=outbound_config.get('minGap', 1.0),
+            max_queue=outbound_config.get('maxQueue', 200),
+            max_age=outbound_config.get('maxAge', 600),
+        )
+
+    def start(self):
+        threading.Thread(target=self._sender, daemon=True).start()
+
+    def enqueue(self, item):
+        import heapq
+        with self._cond:
+            if len(self._heap) >= self.max_queue:
+                worst = max(self._heap)
+                if worst[0] <= item.priority:
+                    self.dropped += 1
+                    print(f"{datetime.now()} - Outbound queue full, dropped message to {item.label()}.")
+                    return False
+                self._heap.remove(worst)
+                heapq.heapify(self._heap)
+                self.dropped += 1
+                print(f"{datetime.now()} - Outbound queue full, dropped queued message to {worst[2].label()}.")
+            self._seq += 1
+            heapq.heappush(self._heap, (item.priority, self._seq, item))
+            self._cond.notify()
+        return True
+
+    # airtime in the current window, for one radio or all of them
+    def airtime_used(self, radio=None):
+        cutoff = time.monotonic() - self.window
+        with self._cond:
+            self._airtime_log = [e for e in self._airtime_log if e[0] > cutoff]
+            return sum(a for _, a, r in self._airtime_log if radio is None or r == radio)
+
+    def airtime_budget(self):
+        if not self.duty_cycle or self.duty_cycle >= 100:
+            return None
+        return self.window * self.duty_cycle / 100.0
+
+    # seconds until `airtime` fits into the budget again
+    def _budget_wait(self, airtime, radio):
+        budget = self.airtime_budget()
+        if budget is None:
+            return 0
+        used = self.airtime_used(radio)
+        if used + airtime <= budget:
+            return 0
+        excess = used + airtime - budget
+        with self._cond:
+            for ts, a, r in self._airtime_log:
+                if r != radio:
+                    continue
+                excess -= a
+                if excess <= 0:
+                    return max(ts + self.window - time.monotonic(), 0.1)
+        return self.window
+
+    def queue_depth(self):
+        with self._cond:
+            depths = {name: 0 for name in PRIORITY_NAMES.values()}
+            for prio, _, _ in self._heap:
+                depths[PRIORITY_NAMES.get(prio, str(prio))] += 1
+            return depths
+
+    # most urgent item whose radio is connected and within its budget; each
+    # radio only looks at its own most urgent item
+    def _next_item(self):
+        with self._cond:
+            candidates = sorted(self._heap)
+        blocked = set()
+        next_wait = 1.0
+        for _, _, item in candidates:
+            age = time.monotonic() - item.queued_at
+            if self.max_age and age > self.max_age:
+                self._pop(item)
+                self.dropped += 1
+                print(f"{datetime.now()} - Message to {item.label()} expired after {age:.0f}s in queue.")
+                continue
+            radio_transport = transport_for(item.radio)
+            if radio_transport is None or radio_transport.port in blocked:
+                continue
+            airtime = estimate_airtime(len(item.text.encode('utf-8')), self.preset)
+            wait = max(self._budget_wait(airtime, radio_transport.port),
+                       self._last_send.get(radio_transport.port, 0) + self.min_gap - time.monotonic())
+            if wait <= 0:
+                return item, radio_transport, airtime, 0
+            blocked.add(radio_transport.port)
+            next_wait = min(next_wait, wait)
+        return None, None, 0, next_wait
+
+    def _sender(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+            item, radio_transport, airtime, wait = self._next_item()
+            if item is None:
+                # wake up early if a more urgent message arrives
+                with self._cond:
+                    self._cond.wait(timeout=min(max(wait, 0.05), 5))
+                continue
+            self._pop(item)
+            if item.nodeid:
+                ok = radio_transport.send_direct(item.nodeid, item.text)
+            else:
+                ok = radio_transport.send_channel(item.channel, item.text)
+            now = time.monotonic()
+            self._last_send[radio_transport.port] = now
+            with self._cond:
+                self._airtime_log.append((now, airtime, radio_transport.port))
+            metrics.observe('meshservices_outbound_wait_seconds', now - item.queued_at,
+                            priority=PRIORITY_NAMES.get(item.priority, str(item.priority)))
+            if ok:
+                self.sent += 1
+                if item.nodeid:
+                    startup_mark('first_reply')
+                print(f"{datetime.now()} - Message sent to {item.label()} ({airtime:.2f}s airtime, waited {now - item.queued_at:.1f}s).")
+
+    def _pop(self, item):
+        import heapq
+        with self._cond:
+            for i, entry in enumerate(self._heap):
+                if entry[2] is item:
+                    self._heap.pop(i)
+                    heapq.heapify(self._heap)
+                    return
+
+outbound = None
+
+# Reply packing: blocks are cut by UTF-8 byte length (the radio limit is bytes,
+# not characters) at word or line boundaries and filled up to the limit.
+MAX_PAYLOAD_BYTES = 233
+
+def max_payload_bytes():
+    try:
+        return int(load_config().get('outbound', {}).get('maxPayloadBytes', MAX_PAYLOAD_BYTES))
+    except Exception:
+        return MAX_PAYLOAD_BYTES
+
+def compact_replies():
+    try:
+        return bool(load_config().get('outbound', {}).get('compact', True))
+    except Exception:
+        return True
+
+def truncate_utf8(text, max_bytes):
+    data = text.encode('utf-8')
+    if len(data) <= max_bytes:
+        return text
+    return data[:max_bytes].decode('utf-8', errors='ignore')
+
+# drop whitespace runs, empty brackets and list bullets
+def compact_text(text):
+    text = re.sub(r'(?m)^\s*-\s+', '', text)
+    text = re.sub(r'\s*(\[\s*\]|\(\s*\))', '', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r' ?\r?\n[\s]*', '\n', text)
+    return text.strip()
+
+def pack_text(text, max_bytes=MAX_PAYLOAD_BYTES, compact=False):
+    if compact:
+        text = compact_text(text)
+    blocks = []
+    current = ''
+    current_len = 0
+    for match in re.finditer(r'(\s*)(\S+)', text):
+        sep, word = match.group(1), match.group(2)
+        if not current:
+            sep = ''
+        piece_len = len((sep + word).encode('utf-8'))
+        if current_len + piece_len <= max_bytes:
+            current += sep + word
+            current_len += piece_len
+            continue
+        # single word longer than a packet: fill up the current block, then
+        # hard split at character boundaries
+        if len(word.encode('utf-8')) > max_bytes:
+            head = truncate_utf8(sep + word, max_bytes - current_len)
+            current += head
+            word = word[max(len(head) - len(sep), 0):]
+            while len(word.encode('utf-8')) > max_bytes:
+                if current:
+                    blocks.append(current)
+                current = truncate_utf8(word, max_bytes)
+                word = word[len(current):]
+        if current:
+            blocks.append(current)
+        current = word
+        current_len = len(word.encode('utf-8'))
+    if current:
+        blocks.append(current)
+    return blocks
+
+# replies go out on the radio that received the request (radio=None: default radio)
+def send_message_to_node(nodeid, text, priority=PRIO_REPLY, compact=False, radio=None):
     if not text or not str(text).strip():
         return
     if nodeid.startswith('0x'):
         nodeid = '!' + nodeid[2:]
-    global ser
+    if job_cancelled():
+        print(f"{datetime.now()} - Service timed out, reply to {nodeid} dropped.")
+        return
     try:
-        max_len = 200
-        blocks = [text[i:i+max_len] for i in range(0, len(text), max_len)]
+        blocks = pack_text(str(text), max_payload_bytes(), compact=compact)
+    except Exception as e:
+        print(f"{datetime.now()} - Unexpected error while sending message to node {nodeid}: {str(e)}")
+        return
+    send_blocks_to_node(nodeid, blocks, priority=priority, radio=radio)
+
+# queues blocks that are already packed (see pack_text); False if not all of
+# them were queued
+def send_blocks_to_node(nodeid, blocks, priority=PRIO_REPLY, radio=None):
+    if nodeid.startswith('0x'):
+        nodeid = '!' + nodeid[2:]
+    if job_cancelled():
+        print(f"{datetime.now()} - Service timed out, reply to {nodeid} dropped.")
+        return False
+    if outbound is None:
+        print(f"{datetime.now()} - Outbound scheduler not started, message to {nodeid} dropped.")
+        return False
+    radio = radio or current_radio()
+    queued = True
+    for idx, block in enumerate(blocks):
+        print(f"{datetime.now()} - Queue message to {nodeid} (Block {idx+1}/{len(blocks)}): {block}")
+        queued = outbound.enqueue(OutboundItem(priority, block, nodeid=nodeid, radio=radio)) and queued
+    return queued
+
+# packed like direct replies; False if not all blocks were queued
+# a channel message from a service goes out on the radio of its request,
+# background messages (warnings) on every connected radio
+def channel_radios(radio=None):
+    radio = radio or current_radio()
+    if radio is not None:
+        return [radio]
+    return [port for port, link in radios.items() if link.connected] or [None]
+
+def send_to_channel(index, text, priority=PRIO_REPLY, radio=None, compact=False):
+    if job_cancelled():
+        print(f"{datetime.now()} - Service timed out, message to channel {index} dropped.")
+        return False
+    if outbound is None:
+        print(f"{datetime.now()} - Outbound scheduler not started, message to channel {index} dropped.")
+        return False
+    blocks = pack_text(str(text), max_payload_bytes(), compact=compact)
+    queued = True
+    for target in channel_radios(radio):
         for idx, block in enumerate(blocks):
-            print(f"{datetime.now()} - Send message to {nodeid} (Block {idx+1}/{len(blocks)}): {block}")
-            ser_was_open = False
-            try:
-                if ser and ser.is_open:
-                    ser.close()
-                    ser_was_open = True
-                    print(f"{datetime.now()} - Serial port closed for sending.")
-            except Exception:
-                pass
-            cli_path = get_meshtastic_cli_path()
-            cmd = f"{cli_path} --dest '{nodeid}' --sendtext '{block}'"
+            if len(blocks) > 1:
+                print(f"{datetime.now()} - Queue message to channel {index} (Block {idx+1}/{len(blocks)}): {block}")
+            queued = outbound.enqueue(OutboundItem(priority, block, channel=int(index), radio=target)) and queued
+    return queued
+
+# Service dispatcher: the serial reader only enqueues, a bounded pool of workers
+# runs the services with per-service concurrency limits, timeouts and a deadline
+# for jobs that waited too long in the queue. Jobs are queued per node and the
+# nodes are served round robin, so one busy node cannot starve the others.
+_job_context = threading.local()
+
+def current_job():
+    return getattr(_job_context, 'job', None)
+
+# port of the radio the current request came in on (service job or reader thread)
+def current_radio():
+    job = current_job()
+    if job is not None:
+        return job.radio
+    return getattr(_job_context, 'radio', None)
+
+# TextPacket of the request the current job serves (channel, SNR, hops ...)
+def current_packet():
+    job = current_job()
+    return job.packet if job is not None else None
+
+def job_cancelled():
+    job = current_job()
+    return bool(job and job.cancelled)
+
+# seconds until the current job hits its timeout, None without job or timeout
+def job_time_left():
+    job = current_job()
+    if job is None or not job.timeout or job.started_at is None:
+        return None
+    return job.timeout - (time.monotonic() - job.started_at)
+
+class ServiceJob:
+    def __init__(self, servicename, content, nodeid, msg_id, radio=None, packet=None):
+        self.servicename = servicename
+        self.content = content
+        self.nodeid = nodeid
+        self.msg_id = msg_id
+        self.radio = radio
+        self.packet = packet
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.timeout = None
+        self.cancelled = False
+
+class ServiceDispatcher:
+    def __init__(self, workers=4, max_wait=60, limits=None, timeouts=None, default_limit=2, default_timeout=60, max_workers=None):
+        from collections import OrderedDict
+        self.workers = max(1, int(workers))
+        # hung threads plus their replacements never exceed this
+        self.max_workers = max(self.workers, int(max_workers or 2 * self.workers))
+        self.max_wait = max_wait
+        self.limits = limits or {}
+        self.timeouts = timeouts or {}
+        self.default_limit = default_limit
+        self.default_timeout = default_timeout
+        self._queues = OrderedDict()
+        self._running = {}
+        self._active = {}
+        self._cond = threading.Condition()
+        self._alive = 0
+        self.dropped = 0
+        self.timed_out = 0
+
+    @classmethod
+    def from_config(cls, dispatch_config):
+        return cls(
+            workers=dispatch_config.get('workers', 4),
+            max_wait=dispatch_config.get('maxWait', 60),
+            limits=dispatch_config.get('limits', {}),
+            timeouts=dispatch_config.get('timeouts', {}),
+            default_limit=dispatch_config.get('defaultLimit', 2),
+            default_timeout=dispatch_config.get('defaultTimeout', 60),
+            max_workers=dispatch_config.get('maxWorkers'),
+        )
+
+    def start(self):
+        with self._cond:
+            for _ in range(self.workers - self._alive):
+                self._spawn_worker()
+        threading.Thread(target=self._watchdog, daemon=True).start()
+
+    def _spawn_worker(self):
+        self._alive += 1
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def submit(self, servicename, content, nodeid, msg_id=None, radio=None, packet=None):
+        job = ServiceJob(servicename, content, nodeid, msg_id, radio, packet)
+        with self._cond:
+            self._queues.setdefault(nodeid, []).append(job)
+            self._cond.notify()
+        return job
+
+    def queue_depth(self):
+        with self._cond:
+            return sum(len(jobs) for jobs in self._queues.values())
+
+    def nodes_waiting(self):
+        with self._cond:
+            return len(self._queues)
+
+    def idle(self):
+        with self._cond:
+            return not self._queues and not self._running
+
+    def _limit(self, servicename):
+        return self.limits.get(servicename, self.default_limit)
+
+    def _timeout(self, servicename):
+        return self.timeouts.get(servicename, self.default_timeout)
+
+    # next runnable job, dropping the ones older than max_wait; the node that
+    # got a job goes to the end of the round
+    def _next_job(self):
+        now = time.monotonic()
+        for nodeid in list(self._queues):
+            jobs = self._queues[nodeid]
+            picked = None
+            for job in list(jobs):
+                if self.max_wait and now - job.queued_at > self.max_wait:
+                    jobs.remove(job)
+                    self.dropped += 1
+                    print(f"{datetime.now()} - Dropped @{job.servicename} for {job.nodeid} (waited {now - job.queued_at:.0f}s).")
+                    continue
+                if self._active.get(job.servicename, 0) < self._limit(job.servicename):
+                    jobs.remove(job)
+                    picked = job
+                    break
+            if not jobs:
+                del self._queues[nodeid]
+            elif picked:
+                self._queues.move_to_end(nodeid)
+            if picked:
+                return picked
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait(timeout=1)
+                    job = self._next_job()
+                self._active[job.servicename] = self._active.get(job.servicename, 0) + 1
+                job.started_at = time.monotonic()
+                job.timeout = self._timeout(job.servicename)
+                self._running[threading.get_ident()] = job
+            metrics.observe('meshservices_dispatch_wait_seconds', job.started_at - job.queued_at, service=job.servicename)
+            metrics.inc('meshservices_service_calls_total', service=job.servicename)
+            _job_context.job = job
             try:
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=15)
-                if result.returncode != 0 or result.stderr:
-                    raise Exception(result.stderr)
-                print(f"{datetime.now()} - Message sent to node: {nodeid}")
+                SERVICES[job.servicename](job.content, job.nodeid, job.msg_id)
             except Exception as e:
-                print(f"{datetime.now()} - Error on first send attempt: {str(e)}. Second attempt with 30s timeout...")
-                try:
-                    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
-                    if result.returncode != 0 or result.stderr:
-                        raise Exception(result.stderr)
-                    print(f"{datetime.now()} - Message sent to node: {nodeid} on second attempt.")
-                except Exception as e2:
-                    print(f"{datetime.now()} - Error on second send attempt to node {nodeid}: {str(e2)}")
-            time.sleep(2)
+                metrics.inc('meshservices_service_errors_total', service=job.servicename)
+                print(f"{datetime.now()} - Error in service @{job.servicename}: {str(e)}")
+            finally:
+                metrics.observe('meshservices_service_seconds', time.monotonic() - job.started_at, service=job.servicename)
+                _job_context.job = None
+                with self._cond:
+                    self._running.pop(threading.get_ident(), None)
+                    # a cancelled job gave its slot back already
+                    if not job.cancelled:
+                        self._active[job.servicename] -= 1
+                    self._cond.notify_all()
+                    # a replacement was started while this job hung
+                    if job.cancelled and self._alive > self.workers:
+                        self._alive -= 1
+                        return
+
+    # python threads cannot be killed: a job over its timeout is marked cancelled
+    # (its replies are dropped), its service slot is released and a replacement
+    # worker keeps the pool size, up to max_workers threads in total
+    def _watchdog(self):
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            with self._cond:
+                for job in self._running.values():
+                    if job.cancelled:
+                        continue
+                    timeout = self._timeout(job.servicename)
+                    if timeout and now - job.started_at > timeout:
+                        job.cancelled = True
+                        self.timed_out += 1
+                        self._active[job.servicename] -= 1
+                        print(f"{datetime.now()} - Service @{job.servicename} for {job.nodeid} exceeded {timeout}s timeout, replies dropped.")
+                        if self._alive < self.max_workers:
+                            self._spawn_worker()
+                        else:
+                            print(f"{datetime.now()} - {self._alive} dispatcher threads alive, no replacement worker started.")
+                        self._cond.notify_all()
+
+dispatcher = None
+
+# Duplicate suppression: rebroadcasts and firmware retries deliver the same
+# packet more than once. Keys are (sender, packet id) in insertion order, so the
+# oldest entries expire from the front; the index is saved for quick restarts.
+class PacketDeduper:
+    def __init__(self, max_entries=4096, ttl=600, path=None, save_interval=30):
+        from collections import OrderedDict
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.save_interval = save_interval
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.duplicates = 0
+
+    @classmethod
+    def from_config(cls, dedup_config):
+        return cls(
+            max_entries=dedup_config.get('maxEntries', 4096),
+            ttl=dedup_config.get('ttl', 600),
+            path=dedup_config.get('file', 'seen_packets.json'),
+        )
+
+    # '0x1a2b' and '!00001a2b' are the same node
+    @staticmethod
+    def make_key(from_id, msg_id):
+        def number(value):
+            value = str(value).strip().lower().lstrip('!')
             try:
-                if ser_was_open and not ser.is_open:
-                    ser.open()
-                    print(f"{datetime.now()} - Serial port reopened.")
+                return int(value, 16)
+            except ValueError:
+                return value
+        return f"{number(from_id)}:{number(msg_id)}"
+
+    def _expire(self, now):
+        while self._seen:
+            key, expires = next(iter(self._seen.items()))
+            if expires > now and len(self._seen) <= self.max_entries:
+                return
+            self._seen.popitem(last=False)
+
+    # True if the packet was seen within ttl, otherwise it is recorded
+    def check(self, from_id, msg_id):
+        if not from_id or not msg_id:
+            return False
+        key = self.make_key(from_id, msg_id)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            if key in self._seen:
+                self.duplicates += 1
+                return True
+            self._seen[key] = now + self.ttl
+            if len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+            self._dirty = True
+            return False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._seen)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            with self._lock:
+                for key, expires in saved:
+                    self._seen[key] = expires
+                self._expire(time.time())
+        except Exception as e:
+            print(f"{datetime.now()} - Error loading {self.path}: {str(e)}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = list(self._seen.items())
+            self._dirty = False
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def start(self):
+        self.load()
+        if self.path:
+            threading.Thread(target=self._save_loop, daemon=True).start()
+
+    def _save_loop(self):
+        while True:
+            time.sleep(self.save_interval)
+            try:
+                self.save()
             except Exception as e:
-                print(f"{datetime.now()} - Error reopening serial port: {str(e)}")
-    except Exception as e:
-        print(f"{datetime.now()} - Unexpected error while sending message to node {nodeid}: {str(e)}")
+                print(f"{datetime.now()} - Error saving {self.path}: {str(e)}")
+
+packet_dedup = None
+
+# Admission control: token buckets per node (all services) and per node and
+# service, refilled continuously. Over-limit requests get a short rejection
+# reply, at most once per rejectCooldown seconds and node. Sensor and system
+# services (exemptServices, default radar and ignore) bypass the limits: radar
+# detections arrive in bursts and must never be dropped.
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, per_minute, burst):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now):
+        self._refill(now)
+        return self.tokens >= 1
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    # seconds until the next token
+    def wait(self, now):
+        self._refill(now)
+        if self.tokens >= 1 or not self.rate:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+class RateLimiter:
+    def __init__(self, node_limit=None, service_limits=None, exempt=None, reject_reply=None,
+                 reject_cooldown=300, max_buckets=2048, exempt_services=('radar', 'ignore')):
+        from collections import OrderedDict
+        self.node_limit = node_limit
+        self.service_limits = service_limits or {}
+        self.exempt = {self.normalize(n) for n in (exempt or [])}
+        self.exempt_services = set(exempt_services or ())
+        self.reject_reply = reject_reply
+        self.reject_cooldown = reject_cooldown
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._rejected_at = {}
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = {}
+
+    @classmethod
+    def from_config(cls, limit_config):
+        def limit(entry):
+            if not entry:
+                return None
+            return (float(entry.get('perMinute', 6)), float(entry.get('burst', 3)))
+        return cls(
+            node_limit=limit(limit_config.get('node', {'perMinute': 6, 'burst': 5})),
+            service_limits={name: limit(entry) for name, entry in limit_config.get('services', {}).items()},
+            exempt=limit_config.get('exempt', []),
+            exempt_services=limit_config.get('exemptServices', ['radar', 'ignore']),
+            reject_reply=limit_config.get('rejectReply', "Zu viele Anfragen, bitte in {wait}s erneut versuchen."),
+            reject_cooldown=limit_config.get('rejectCooldown', 300),
+            max_buckets=limit_config.get('maxBuckets', 2048),
+        )
+
+    @staticmethod
+    def normalize(nodeid):
+        nodeid = str(nodeid)
+        return '!' + nodeid[2:] if nodeid.startswith('0x') else nodeid
+
+    def _bucket(self, key, limit):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*limit)
+            # least recently used buckets go first; a dropped bucket starts full
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    # (True, 0) if the request may run, else (False, seconds until it would)
+    def admit(self, nodeid, servicename):
+        nodeid = self.normalize(nodeid)
+        if nodeid in self.exempt or servicename in self.exempt_services:
+            return True, 0
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            if self.node_limit:
+                buckets.append(self._bucket((nodeid, None), self.node_limit))
+            if self.service_limits.get(servicename):
+                buckets.append(self._bucket((nodeid, servicename), self.service_limits[servicename]))
+            if all(b.available(now) for b in buckets):
+                for b in buckets:
+                    b.take(now)
+                self.admitted += 1
+                return True, 0
+            self.rejected[servicename] = self.rejected.get(servicename, 0) + 1
+            return False, max(b.wait(now) for b in buckets)
+
+    # True if this node should be told about the rejection (not too often)
+    def should_notify(self, nodeid):
+        nodeid = self.normalize(nodeid)
+        now = time.monotonic()
+        with self._lock:
+            last = self._rejected_at.get(nodeid)
+            if last is not None and now - last < self.reject_cooldown:
+                return False
+            self._rejected_at[nodeid] = now
+            if len(self._rejected_at) > self.max_buckets:
+                cutoff = now - self.reject_cooldown
+                self._rejected_at = {n: t for n, t in self._rejected_at.items() if t > cutoff}
+            return True
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            limited = {key[0] for key, b in self._buckets.items() if not b.available(now)}
+            return {
+                'buckets': len(self._buckets),
+                'limited_nodes': len(limited),
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected),
+            }
+
+rate_limiter = None
 
+# built-in services are on unless switched off, plugins only when switched on
 def is_service_enabled(servicename):
+    default = SERVICES.is_builtin(servicename)
     try:
-        config = load_services_config()
-        if servicename == 'echo':
-            return config.get('echo', True)
-        return config.get(servicename, True)
+        return bool(load_services_config().get(servicename, default))
     except Exception:
-        return True
+        return default
+
+# parse one received packet: service calls go to the dispatcher, everything
+# else is logged
+def process_packet(packet, log_enabled, log_file="messages.jsonl", radio=None):
+    text = packet.text.lstrip()
+    nodeid = packet.from_id
+    msg_id = packet.msg_id
+    if packet_dedup is not None and packet_dedup.check(nodeid, msg_id):
+        metrics.inc('meshservices_duplicates_total')
+        print(f"{datetime.now()} - Duplicate packet from {nodeid} (MsgID: {msg_id}) ignored.")
+        return
+    if text.startswith('@'):
+        # extract possible service call name
+        match = re.match(r"@([a-zA-Z0-9_\-]+)", text)
+        if match:
+            servicename = match.group(1).lower()
+            content = text[match.end():].lstrip()
+            print(f"{datetime.now()} - Service call detected: @{servicename} (NodeID: {nodeid}, MsgID: {msg_id}) with content: '{content}'")
+            if servicename in SERVICES:
+                if not is_service_enabled(servicename):
+                    print(f"{datetime.now()} - Service @{servicename} is disabled.")
+                    return
+                allowed, wait = rate_limiter.admit(nodeid, servicename) if rate_limiter else (True, 0)
+                if allowed:
+                    dispatcher.submit(servicename, content, nodeid, msg_id, radio=radio, packet=packet)
+                else:
+                    metrics.inc('meshservices_ratelimit_rejected_total', service=servicename)
+                    print(f"{datetime.now()} - Rate limit for {nodeid} on @{servicename}, request rejected.")
+                    if rate_limiter.reject_reply and rate_limiter.should_notify(nodeid):
+                        send_message_to_node(nodeid, rate_limiter.reject_reply.format(wait=int(wait) + 1), priority=PRIO_ECHO, radio=radio)
+            else:
+                print(f"{datetime.now()} - No service registered for @{servicename}. Ignore.")
+        return
+    msg_data = packet.to_log_entry()
+    if log_enabled:
+        log_json_message(msg_data, log_file, log_shipper)
+    else:
+        print(f"{datetime.now()} - Message received, but logging service is disabled: {msg_data}")
+
+# outbox, cache, outbound scheduler and dispatcher shared by all readers
+def start_pipeline(outbound_cls=None):
+    plugins_config = load_config().get('plugins', {})
+    SERVICES.discover(plugins_config.get('package', 'plugins'), plugins_config.get('entryPoints', True))
+    SERVICES.load_enabled()
+
+    global packet_dedup
+    packet_dedup = PacketDeduper.from_config(load_config().get('dedup', {}))
+    packet_dedup.start()
+
+    global rate_limiter
+    rate_limiter = RateLimiter.from_config(load_config().get('ratelimit', {}))
+
+    global mail_outbox
+    mail_outbox = MailOutbox.from_config(load_config().get('mail', {}).get('outbox', {}))
+    mail_outbox.start()
+
+    global response_cache
+    response_cache = ResponseCache.from_config(load_config().get('cache', {}))
+    response_cache.start()
+
+    global outbound
+    outbound = (outbound_cls or OutboundScheduler).from_config(load_config().get('outbound', {}))
+    outbound.start()
+
+    global dispatcher
+    dispatcher = ServiceDispatcher.from_config(load_config().get('dispatch', {}))
+    dispatcher.start()
+
+    register_pipeline_gauges()
 
 def main():
+    # background threads below send through the pipeline
+    start_pipeline()
+
     # silent background fetching for @warn - but nobody asked
     warn_thread = threading.Thread(target=warn_background_loop, daemon=True)
     warn_thread.start()
 
+    news_thread = threading.Thread(target=news_background_loop, daemon=True)
+    news_thread.start()
+
     radar_update_thread = threading.Thread(target=update_radar_config_loop, daemon=True)
     radar_update_thread.start()
 
+    config_thread = threading.Thread(target=config_watch_loop, daemon=True)
+    config_thread.start()
+
+    metrics_config = load_config().get('metrics', {})
+    if metrics_config.get('enabled', False):
+        try:
+            start_metrics_server(metrics_config.get('host', '127.0.0.1'), int(metrics_config.get('port', 9464)))
+        except Exception as e:
+            print(f"{datetime.now()} - Error starting metrics server: {str(e)}")
+    threading.Thread(target=metrics_summary_loop, daemon=True).start()
+
     while True:
         try:
-            global ser
             config = load_config()
-            services = load_services_config()
-            ser = None
-            BAUD_RATE = 115200
             LOG_FILE = "messages.jsonl"
             log_service = config.get('log', {})
             log_enabled = log_service.get('enabled', True)
@@ -813,69 +3967,26 @@ def main():
             log_api_key = log_service.get('api_key')
             if log_enabled and (not log_api_url or not log_api_key):
                 log_enabled = False
-            config_port = config['serial'].get('port')
-            if isinstance(config_port, list):
-                SERIAL_PORT = find_serial_port(config_port)
-            else:
-                SERIAL_PORT = config_port
-            if not SERIAL_PORT:
+            global log_shipper
+            if log_enabled and log_shipper is None:
+                log_shipper = LogShipper.from_config(log_service)
+                log_shipper.start()
+            links = configured_radios(config['serial'])
+            if not links:
                 print(f"{datetime.now()} - Error: No serial port found in configuration!")
                 while True:
                     time.sleep(60)
-            print(f"{datetime.now()} - Serial port from configuration used: {SERIAL_PORT}")
-            import os
+            for link in links:
+                radios[link.port] = link
+                print(f"{datetime.now()} - Serial port from configuration used: {', '.join(link.candidates)}")
+                link.start(log_enabled, LOG_FILE)
             while True:
-                while not os.path.exists(SERIAL_PORT):
-                    print(f"{datetime.now()} - No device on serial {SERIAL_PORT} found.")
-                    time.sleep(5)
-                ser = None
-                try:
-                    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-                    print(f"{datetime.now()} - Serial output recognized on {SERIAL_PORT}, waiting for messages.")
-                    while True:
-                        try:
-                            line = ser.readline().decode('utf-8', errors='ignore').strip()
-                        except Exception as e:
-                            print(f"{datetime.now()} - Error reading from serial port: {str(e)}")
-                            break
-                        if line and "Received text msg" in line:
-                            msg_data = extract_text_message(line)
-                            if msg_data:
-                                text = msg_data['text'].lstrip()
-                                nodeid = msg_data['from']
-                                msg_id = msg_data['msg_id']
-                                if text.startswith('@'):
-                                    # extract possible service call name
-                                    match = re.match(r"@([a-zA-Z0-9_\-]+)", text)
-                                    if match:
-                                        servicename = match.group(1).lower()
-                                        content = text[match.end():].lstrip()
-                                        print(f"{datetime.now()} - Service call detected: @{servicename} (NodeID: {nodeid}, MsgID: {msg_id}) with content: '{content}'")
-                                        if servicename in SERVICES and SERVICES[servicename]:
-                                            if is_service_enabled(servicename):
-                                                SERVICES[servicename](content, nodeid, msg_id)
-                                            else:
-                                                print(f"{datetime.now()} - Service @{servicename} is disabled.")
-                                        else:
-                                            print(f"{datetime.now()} - No service registered for @{servicename}. Ignore.")
-                                    continue
-                                if log_enabled:
-                                    log_json_message(msg_data, LOG_FILE, log_api_url, log_api_key)
-                                else:
-                                    print(f"{datetime.now()} - Message received, but logging service is disabled: {msg_data}")
-                except Exception as e:
-                    print(f"{datetime.now()} - Error opening or reading from serial port: {str(e)}")
-                finally:
-                    if ser:
-                        try:
-                            ser.close()
-                        except Exception:
-                            pass
-                    print(f"{datetime.now()} - Connection to {SERIAL_PORT} lost or error. Restarting monitoring.")
-                    time.sleep(5)
+                time.sleep(60)
         except Exception as fatal:
             print(f"{datetime.now()} - FATAL ERROR in main loop: {fatal}")
             time.sleep(10)
 
 if __name__ == "__main__":
+    # plugins import `meshservices`; make that this module, not a second copy
+    sys.modules['meshservices'] = sys.modules[__name__]
     main()
@@ -0,0 +1,300 @@
+import argparse
+import glob
+import gzip
+import io
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Local message log: the active segment is messages.jsonl, closed segments are
+# renamed to messages-YYYYmmdd-HHMMSS-ffffff.jsonl, compressed (zstd if the zstandard
+# package is installed, else gzip) and get a small sidecar index
+# (.idx.json: time range and per-node counts) so queries skip unrelated files.
+#
+# python3 msglog.py [--from !abcd1234] [--since 2026-10-17] [--until 2026-10-18T12:00] [--grep text] [--log messages.jsonl]
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SEGMENT_SUFFIXES = ('.jsonl.zst', '.jsonl.gz', '.jsonl')
+# segment names sort by time; a new segment is always named after the newest
+SEGMENT_STAMP = '%Y%m%d-%H%M%S-%f'
+
+def normalize_node(nodeid):
+    return '!' + nodeid[2:] if nodeid and nodeid.startswith('0x') else nodeid
+
+class SegmentIndex:
+    def __init__(self):
+        self.first = None
+        self.last = None
+        self.count = 0
+        self.nodes = {}
+
+    def add(self, entry):
+        ts = entry.get('timestamp')
+        if ts:
+            if self.first is None or ts < self.first:
+                self.first = ts
+            if self.last is None or ts > self.last:
+                self.last = ts
+        self.count += 1
+        node = self.nodes.setdefault(entry.get('from') or '', [0, ts, ts])
+        node[0] += 1
+        if ts:
+            node[1] = min(node[1] or ts, ts)
+            node[2] = max(node[2] or ts, ts)
+
+    def to_json(self):
+        return {'first': self.first, 'last': self.last, 'count': self.count, 'nodes': self.nodes}
+
+    @classmethod
+    def from_json(cls, data):
+        index = cls()
+        index.first = data.get('first')
+        index.last = data.get('last')
+        index.count = data.get('count', 0)
+        index.nodes = data.get('nodes', {})
+        return index
+
+    # False if the segment certainly has no matching entry
+    def may_match(self, node=None, since=None, until=None):
+        first, last = self.first, self.last
+        if node is not None:
+            if node not in self.nodes:
+                return False
+            _, first, last = self.nodes[node]
+        if since and last and last < since:
+            return False
+        if until and first and first > until:
+            return False
+        return True
+
+def open_segment(path):
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"{path} needs the zstandard package")
+        raw = open(path, 'rb')
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+def read_entries(path):
+    with open_segment(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def compress_file(path, compression):
+    if compression == 'zstd' and zstandard is not None:
+        target = path + '.zst'
+        with open(path, 'rb') as src, open(target + '.tmp', 'wb') as dst:
+            zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+    else:
+        target = path + '.gz'
+        with open(path, 'rb') as src, gzip.open(target + '.tmp', 'wb', compresslevel=6) as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+    os.replace(target + '.tmp', target)
+    os.remove(path)
+    return target
+
+class MessageLog:
+    def __init__(self, path='messages.jsonl', max_bytes=5 * 1024 * 1024, max_age=86400, compression='auto', keep=100):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression if compression != 'auto' else ('zstd' if zstandard else 'gzip')
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._compress_lock = threading.Lock()
+        self._index = SegmentIndex()
+        self._size = 0
+        self._opened_at = time.time()
+        self._scan_active()
+        threading.Thread(target=self._recover, daemon=True).start()
+
+    @classmethod
+    def from_config(cls, path, rotate_config):
+        return cls(
+            path,
+            max_bytes=rotate_config.get('maxBytes', 5 * 1024 * 1024),
+            max_age=rotate_config.get('maxAge', 86400),
+            compression=rotate_config.get('compression', 'auto'),
+            keep=rotate_config.get('keep', 100),
+        )
+
+    @property
+    def base(self):
+        return self.path[:-len('.jsonl')] if self.path.endswith('.jsonl') else self.path
+
+    # rebuilds the index of the active segment after a restart; its age counts
+    # from the first entry
+    def _scan_active(self):
+        if not os.path.exists(self.path):
+            return
+        self._size = os.path.getsize(self.path)
+        for entry in read_entries(self.path):
+            self._index.add(entry)
+        try:
+            self._opened_at = datetime.fromisoformat(self._index.first).timestamp()
+        except (TypeError, ValueError):
+            self._opened_at = os.path.getmtime(self.path)
+
+    def append(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        line_bytes = len(line.encode('utf-8'))
+        with self._lock:
+            if self._size and (self._size + line_bytes > self.max_bytes or
+                               (self.max_age and time.time() - self._opened_at > self.max_age)):
+                self._rotate()
+            with open(self.path, "a", encoding='utf-8') as f:
+                f.write(line)
+            if not self._size:
+                self._opened_at = time.time()
+            self._size += line_bytes
+            self._index.add(entry)
+
+    # current time, but never before the newest existing segment (clock steps)
+    def _segment_name(self):
+        stamp = datetime.now()
+        stems = segment_stems(self.base)
+        if stems:
+            try:
+                newest = datetime.strptime(stems[-1][len(self.base) + 1:], SEGMENT_STAMP)
+            except ValueError:
+                newest = None
+            if newest is not None and stamp <= newest:
+                stamp = newest + timedelta(microseconds=1)
+        return f"{self.base}-{stamp.strftime(SEGMENT_STAMP)}"
+
+    def _rotate(self):
+        segment = self._segment_name()
+        os.replace(self.path, segment + '.jsonl')
+        write_index(segment, self._index)
+        self._index = SegmentIndex()
+        self._size = 0
+        threading.Thread(target=self._close_segment, args=(segment + '.jsonl',), daemon=True).start()
+
+    def _close_segment(self, path):
+        with self._compress_lock:
+            try:
+                if os.path.exists(path):
+                    compress_file(path, self.compression)
+            except Exception as e:
+                print(f"{datetime.now()} - Error compressing {path}: {str(e)}")
+            self._expire()
+
+    def _expire(self):
+        if not self.keep:
+            return
+        for stem in segment_stems(self.base)[:-self.keep]:
+            for suffix in SEGMENT_SUFFIXES + ('.idx.json',):
+                try:
+                    os.remove(stem + suffix)
+                except FileNotFoundError:
+                    pass
+
+    # closed segments left uncompressed or without index by a crash
+    def _recover(self):
+        for stem in segment_stems(self.base):
+            if not os.path.exists(stem + '.idx.json'):
+                data = segment_file(stem)
+                if data:
+                    index = SegmentIndex()
+                    for entry in read_entries(data):
+                        index.add(entry)
+                    write_index(stem, index)
+            if os.path.exists(stem + '.jsonl'):
+                self._close_segment(stem + '.jsonl')
+
+def write_index(stem, index):
+    tmp = stem + '.idx.json.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index.to_json(), f, ensure_ascii=False)
+    os.replace(tmp, stem + '.idx.json')
+
+def load_index(stem):
+    try:
+        with open(stem + '.idx.json', encoding='utf-8') as f:
+            return SegmentIndex.from_json(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+def segment_file(stem):
+    for suffix in SEGMENT_SUFFIXES:
+        if os.path.exists(stem + suffix):
+            return stem + suffix
+    return None
+
+# closed segments, oldest first (the names sort by time)
+def segment_stems(base):
+    stems = set()
+    for path in glob.glob(glob.escape(base) + '-*'):
+        for suffix in SEGMENT_SUFFIXES + ('.idx.json',):
+            if path.endswith(suffix):
+                stems.add(path[:-len(suffix)])
+                break
+    return sorted(stems)
+
+# streams matching entries, oldest first, reading only segments whose index
+# may contain them
+def query(path='messages.jsonl', node=None, since=None, until=None, text=None):
+    base = path[:-len('.jsonl')] if path.endswith('.jsonl') else path
+    node = normalize_node(node)
+    files = []
+    for stem in segment_stems(base):
+        index = load_index(stem)
+        if index is not None and not index.may_match(node, since, until):
+            continue
+        data = segment_file(stem)
+        if data:
+            files.append(data)
+    if os.path.exists(path):
+        files.append(path)
+    needle = text.lower() if text else None
+    for data in files:
+        for entry in read_entries(data):
+            ts = entry.get('timestamp') or ''
+            if node is not None and entry.get('from') != node:
+                continue
+            if since and ts < since:
+                continue
+            if until and ts > until:
+                continue
+            if needle and needle not in (entry.get('text') or '').lower():
+                continue
+            yield entry
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local message log")
+    parser.add_argument('--log', default='messages.jsonl', help="active log file, segments are found next to it")
+    parser.add_argument('--from', dest='node', help="node id (!abcd1234 or 0xabcd1234)")
+    parser.add_argument('--since', help="ISO timestamp or date")
+    parser.add_argument('--until', help="ISO timestamp or date (a date includes the whole day)")
+    parser.add_argument('--grep', help="case-insensitive text match")
+    args = parser.parse_args()
+    until = args.until
+    if until and len(until) == 10:
+        until += 'T23:59:59.999999'
+    try:
+        for entry in query(args.log, args.node, args.since, until, args.grep):
+            sys.stdout.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except BrokenPipeError:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import argparse
+import contextlib
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests.adapters
+
+import meshservices as ms
+from debug import read_capture
+
+# Replays a capture from `debug.py --capture` through the gateway pipeline
+# (packet parsing, dispatcher, services, outbound queue) with a fake radio and
+# local HTTP/SMTP stand-ins, then reports throughput and latencies.
+#
+# python3 replay.py capture.bin [--speed 1|10|max] [--http-latency 0.2] [--quiet]
+
+# Fake radio: serves the captured bytes with their original timing (divided by
+# speed) and records what the gateway sends.
+class ReplayTransport(ms.RadioTransport):
+    name = 'replay'
+
+    def __init__(self, records, speed=1.0):
+        super().__init__('replay')
+        self._records = iter(records)
+        self.speed = speed
+        self._start = None
+        self._frames = ms.StreamFrameParser()
+        self._protobufs = None
+        self._line_buf = b''
+        self._pending = []
+        self.exhausted = False
+        self.sent = []
+
+    def _parse(self, data):
+        packets = []
+        self._line_buf += data
+        *lines, self._line_buf = self._line_buf.split(b'\n')
+        for raw in lines:
+            line = raw.decode('utf-8', errors='ignore')
+            if "Received text msg" in line:
+                msg_data = ms.extract_text_message(line)
+                if msg_data:
+                    packets.append(ms.TextPacket.from_msg_data(msg_data))
+        for payload in self._frames.feed(data):
+            if self._protobufs is None:
+                self._protobufs = ms.meshtastic_protobufs()
+            try:
+                packet, _ = ms.decode_from_radio(payload, *self._protobufs)
+            except Exception:
+                continue
+            if packet:
+                packets.append(packet)
+        return packets
+
+    # returns (packet, time it was read) or None once the capture is exhausted
+    def read_timed(self):
+        while not self._pending:
+            record = next(self._records, None)
+            if record is None:
+                self.exhausted = True
+                return None
+            offset, data = record
+            if self._start is None:
+                self._start = time.monotonic() - offset / (self.speed or 1)
+            if self.speed:
+                delay = self._start + offset / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            read_at = time.monotonic()
+            self._pending.extend((packet, read_at) for packet in self._parse(data))
+        return self._pending.pop(0)
+
+    def read_message(self, timeout=1):
+        timed = self.read_timed()
+        return timed[0] if timed else None
+
+    def _send(self, text, dest=None, channel=0, timeout=15):
+        self.sent.append((time.monotonic(), dest or f"ch{channel}", text))
+
+# Outbound scheduler that remembers when each service job queued its first reply
+class RecordingOutbound(ms.OutboundScheduler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replies = {}
+        self._record_lock = threading.Lock()
+
+    def enqueue(self, item):
+        job = ms.current_job()
+        if job is not None:
+            with self._record_lock:
+                self.replies.setdefault(job.msg_id, (time.monotonic(), job))
+        return super().enqueue(item)
+
+# Sends every request of the shared HTTP session to the local stand-in; the
+# original host is passed along in a header.
+class StandInAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, base_url, **kwargs):
+        self.base_url = base_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        request.headers['X-Original-Host'] = url.netloc
+        request.url = f"{self.base_url}{url.path or '/'}" + (f"?{url.query}" if url.query else '')
+        return super().send(request, **kwargs)
+
+STANDIN_WEATHER = {
+    "current_condition": [{"temp_C": "12", "FeelsLikeC": "10", "weatherDesc": [{"value": "Bewölkt"}],
+                           "windspeedKmph": "14", "humidity": "71"}],
+    "weather": [{"hourly": [{"chanceofrain": "40"}]}],
+}
+STANDIN_WIKI = {"type": "standard", "extract": "Ein Artikel aus dem Stand-in. Er hat zwei Sätze. Und einen dritten."}
+STANDIN_FEED = ('<?xml version="1.0"?><rss version="2.0"><channel><title>Stand-in</title>' + ''.join(
+    f'<item><title>Schlagzeile {i}</title><link>http://example.org/news{i}</link><guid>news{i}</guid></item>' for i in range(10)
+) + '</channel></rss>')
+STANDIN_RESULTS = ''.join(
+    f'<a class="result__a" href="http://example.org/result{i}">Ergebnis {i}</a>' for i in range(5)
+)
+STANDIN_PAGE = '<html><body><div><p>' + ' '.join(f"Wort{i}" for i in range(200)) + '</p></div></body></html>'
+
+def make_http_standin(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, body, content_type, etag=None):
+            if latency:
+                time.sleep(latency)
+            if etag and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            if etag:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            host = self.headers.get('X-Original-Host', '')
+            if 'wttr.in' in host:
+                self._reply(json.dumps(STANDIN_WEATHER), 'application/json')
+            elif 'duckduckgo' in host:
+                self._reply(f"<html><body>{STANDIN_RESULTS}</body></html>", 'text/html')
+            elif 'tagesschau.de' in host:
+                self._reply(STANDIN_FEED, 'application/rss+xml', etag='"replay-feed"')
+            elif 'wikipedia.org' in host:
+                if self.path.startswith('/w/api.php'):
+                    self._reply(json.dumps(["", ["Ergebnis"], [""], [""]]), 'application/json')
+                else:
+                    self._reply(json.dumps(STANDIN_WIKI), 'application/json')
+            elif 'warnung.bund.de' in host:
+                self._reply('[]', 'application/json')
+            else:
+                self._reply(STANDIN_PAGE, 'text/html; charset=utf-8')
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length)
+            if self.path.startswith('/translate'):
+                # LibreTranslate API: tags every text with the target language
+                request = json.loads(body or b'{}')
+                texts = request.get('q', [])
+                texts = texts if isinstance(texts, list) else [texts]
+                translated = [f"[{request.get('target')}] {text}" for text in texts]
+                self._reply(json.dumps({'translatedText': translated}), 'application/json')
+                return
+            self._reply('{"status": "ok"}', 'application/json')
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Minimal SMTP server that accepts and counts every mail (no TLS, no auth)
+class SmtpStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.received = 0
+        super().__init__(('127.0.0.1', 0), SmtpStandInHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+class SmtpStandInHandler(socketserver.StreamRequestHandler):
+    def _send(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def handle(self):
+        self._send('220 replay ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', errors='ignore').strip().upper()
+            if command.startswith('EHLO') or command.startswith('HELO'):
+                self._send('250 replay')
+            elif command == 'DATA':
+                self._send('354 end with .')
+                while True:
+                    data = self.rfile.readline()
+                    if not data:
+                        return
+                    if data.rstrip(b'\r\n') == b'.':
+                        break
+                self.server.received += 1
+                self._send('250 queued')
+            elif command == 'QUIT':
+                self._send('221 bye')
+                return
+            else:
+                self._send('250 ok')
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+def stage_line(name, values):
+    ms_values = [v * 1000 for v in values]
+    return (f"{name:<22} n={len(values):<6} p50={percentile(ms_values, 50):9.1f}ms "
+            f"p95={percentile(ms_values, 95):9.1f}ms p99={percentile(ms_values, 99):9.1f}ms")
+
+def load_json(path, fallback):
+    for candidate in (path, fallback):
+        if os.path.exists(candidate):
+            with open(candidate, encoding='utf-8') as f:
+                return json.load(f)
+    return {}
+
+def replay_config(http_url, smtp_port, workdir, keep_airtime, keep_ratelimit):
+    config = load_json('config.json', 'example.config.json')
+    config.setdefault('serial', {})['port'] = 'replay'
+    config['log'] = dict(config.get('log', {}), enabled=True, api_url=f"{http_url}/log", api_key='replay',
+                         spoolFile=os.path.join(workdir, 'logspool.jsonl'))
+    config['radar_api_log'] = {'url': f"{http_url}/radar", 'key': 'replay'}
+    mail = config.setdefault('mail', {})
+    mail['smtp'] = {'server': '127.0.0.1', 'port': smtp_port, 'user': 'replay@localhost', 'password': '', 'starttls': False}
+    mail['outbox'] = dict(mail.get('outbox', {}), spoolFile=os.path.join(workdir, 'mailspool.json'), digestWindow=1)
+    config['cache'] = dict(config.get('cache', {}), file=None)
+    config['translate'] = dict(config.get('translate', {}), backend='libretranslate', url=http_url)
+    config['news'] = dict(config.get('news', {}), stateFile=os.path.join(workdir, 'news_state.json'))
+    config['dedup'] = dict(config.get('dedup', {}), file=os.path.join(workdir, 'seen_packets.json'))
+    if not keep_airtime:
+        config['outbound'] = dict(config.get('outbound', {}), minGap=0, dutyCycle=100)
+    if not keep_ratelimit:
+        config['ratelimit'] = {'node': None, 'services': {}}
+    return config
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a serial capture through the gateway pipeline")
+    parser.add_argument('capture')
+    parser.add_argument('--speed', default='1', help="1 = real time, N = N times faster, max = no delays")
+    parser.add_argument('--http-latency', type=float, default=0.0, help="seconds added by the HTTP stand-in")
+    parser.add_argument('--keep-airtime', action='store_true', help="keep minGap and duty cycle limits")
+    parser.add_argument('--keep-ratelimit', action='store_true', help="keep the per-node request limits")
+    parser.add_argument('--drain-timeout', type=float, default=120)
+    parser.add_argument('--quiet', action='store_true', help="hide the gateway log output")
+    args = parser.parse_args()
+    speed = 0 if args.speed == 'max' else float(args.speed)
+
+    workdir = tempfile.mkdtemp(prefix='meshreplay-')
+    http = make_http_standin(args.http_latency)
+    http_url = f"http://127.0.0.1:{http.server_port}"
+    smtp = SmtpStandIn()
+    ms.CONFIG.pin(replay_config(http_url, smtp.server_address[1], workdir, args.keep_airtime, args.keep_ratelimit))
+    ms.RADAR_CONFIG.pin(load_json('radarconfig.json', 'example.radarconfig.json'))
+    ms.warned_ids = ms.WarnedIdStore(os.path.join(workdir, 'warned_ids.json'))
+    adapter = StandInAdapter(http_url, pool_connections=20, pool_maxsize=20)
+    ms.http_session().mount('http://', adapter)
+    ms.http_session().mount('https://', adapter)
+
+    transport = ReplayTransport(read_capture(args.capture), speed=speed)
+    out = open(os.devnull, 'w') if args.quiet else sys.stdout
+    read_times = {}
+    parse_times = []
+    with contextlib.redirect_stdout(out):
+        ms.start_pipeline(outbound_cls=RecordingOutbound)
+        recording = ms.outbound
+        ms.transport = transport
+        ms.log_shipper = ms.LogShipper.from_config(ms.load_config()['log'])
+        ms.log_shipper.start()
+        started = time.monotonic()
+        packets = 0
+        while True:
+            timed = transport.read_timed()
+            if timed is None:
+                break
+            packet, read_at = timed
+            packets += 1
+            read_times.setdefault(packet.msg_id, read_at)
+            ms.process_packet(packet, True, os.path.join(workdir, 'messages.jsonl'))
+            parse_times.append(time.monotonic() - read_at)
+        fed = time.monotonic()
+        deadline = fed + args.drain_timeout
+        while time.monotonic() < deadline:
+            if ms.dispatcher.idle() and not sum(recording.queue_depth().values()) and not ms.mail_outbox.queue_depth():
+                break
+            time.sleep(0.05)
+        finished = time.monotonic()
+
+    dispatch_wait = []
+    service_time = []
+    end_to_end = []
+    for msg_id, (queued_at, job) in recording.replies.items():
+        if job.started_at is not None:
+            dispatch_wait.append(job.started_at - job.queued_at)
+            service_time.append(queued_at - job.started_at)
+        if msg_id in read_times:
+            end_to_end.append(queued_at - read_times[msg_id])
+    elapsed = max(finished - started, 1e-9)
+    print(f"Replay of {args.capture} at speed {args.speed}: {packets} packets in {elapsed:.2f}s "
+          f"(feeding {fed - started:.2f}s)")
+    print(f"throughput: {packets / elapsed:.1f} packets/s, {len(recording.replies) / elapsed:.1f} replies/s, "
+          f"{len(transport.sent)} packets sent, {smtp.received} mails")
+    print(stage_line("parse + enqueue", parse_times))
+    print(stage_line("dispatch queue wait", dispatch_wait))
+    print(stage_line("service to reply", service_time))
+    print(stage_line("received to reply", end_to_end))
+    if not ms.dispatcher.idle():
+        print(f"warning: dispatcher still busy after {args.drain_timeout:.0f}s drain timeout")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import bz2
+import gzip
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+# Offline title -> summary index for @wiki, built from a Wikipedia abstracts
+# dump (e.g. dewiki-latest-abstract.xml.gz) or a title<TAB>summary file.
+#
+# python3 wikiindex.py build dewiki-latest-abstract.xml.gz wiki-de.idx
+# python3 wikiindex.py lookup wiki-de.idx "Titel"
+#
+# Layout: magic, entry count, a table of (title hash, offset, length) sorted by
+# hash, then the records "title\0summary". Lookups are a binary search in the
+# memory-mapped table, nothing is loaded into memory.
+
+WIKI_INDEX_MAGIC = b'MSWIKI1\n'
+WIKI_INDEX_COUNT = struct.Struct('<Q')
+# big-endian hash first, so the packed records sort by hash
+WIKI_INDEX_RECORD = struct.Struct('>QQI')
+
+def normalize_title(title):
+    return ' '.join(title.replace('_', ' ').split()).casefold()
+
+def title_hash(title):
+    return int.from_bytes(hashlib.blake2b(normalize_title(title).encode('utf-8'), digest_size=8).digest(), 'big')
+
+def first_sentences(text, count=2):
+    sentences = re.split(r'(?<=[.!?])\s+(?=[A-ZÄÖÜ0-9])', ' '.join(text.split()))
+    return ' '.join(sentences[:count])
+
+class WikiIndex:
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, 'rb')
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(WIKI_INDEX_MAGIC)] != WIKI_INDEX_MAGIC:
+            raise ValueError(f"{path} is not a wiki index")
+        self.count = WIKI_INDEX_COUNT.unpack_from(self._mm, len(WIKI_INDEX_MAGIC))[0]
+        self._table = len(WIKI_INDEX_MAGIC) + WIKI_INDEX_COUNT.size
+        self._data = self._table + self.count * WIKI_INDEX_RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i):
+        return WIKI_INDEX_RECORD.unpack_from(self._mm, self._table + i * WIKI_INDEX_RECORD.size)
+
+    def lookup(self, title):
+        key = title_hash(title)
+        wanted = normalize_title(title)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        # equal hashes are adjacent; the title is compared to rule out collisions
+        while lo < self.count:
+            h, offset, length = self._record(lo)
+            if h != key:
+                return None
+            raw = self._mm[self._data + offset:self._data + offset + length]
+            stored_title, _, summary = raw.partition(b'\0')
+            if normalize_title(stored_title.decode('utf-8')) == wanted:
+                return summary.decode('utf-8')
+            lo += 1
+        return None
+
+    def close(self):
+        self._mm.close()
+        self._f.close()
+
+def open_dump(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+# yields (title, abstract) from an abstracts dump or a TSV file
+def read_abstracts(path):
+    if path.endswith('.tsv') or path.endswith('.tsv.gz'):
+        with open_dump(path) as f:
+            for line in f:
+                title, _, summary = line.decode('utf-8', errors='ignore').rstrip('\n').partition('\t')
+                yield title, summary
+        return
+    with open_dump(path) as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag != 'doc':
+                continue
+            title = elem.findtext('title') or ''
+            abstract = elem.findtext('abstract') or ''
+            elem.clear()
+            yield re.sub(r'^Wikipedia:\s*', '', title), abstract
+
+def usable_abstract(text):
+    text = ' '.join(text.split())
+    return len(text) >= 20 and not text.startswith(('|', '{', '!', '['))
+
+def build_index(source, path, sentences=2):
+    records = []
+    written = 0
+    with tempfile.TemporaryFile() as data:
+        for title, abstract in read_abstracts(source):
+            if not title or not usable_abstract(abstract):
+                continue
+            raw = title.encode('utf-8') + b'\0' + first_sentences(abstract, sentences).encode('utf-8')
+            records.append(WIKI_INDEX_RECORD.pack(title_hash(title), written, len(raw)))
+            data.write(raw)
+            written += len(raw)
+        records.sort()
+        data.seek(0)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as out:
+            out.write(WIKI_INDEX_MAGIC)
+            out.write(WIKI_INDEX_COUNT.pack(len(records)))
+            out.writelines(records)
+            while True:
+                chunk = data.read(1024 * 1024)
+                if not chunk:
+                    break
+                out.write(chunk)
+        os.replace(tmp, path)
+    return len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the offline @wiki index")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build')
+    build.add_argument('source', help="abstracts dump (.xml, .xml.gz, .xml.bz2) or title<TAB>summary .tsv")
+    build.add_argument('index')
+    build.add_argument('--sentences', type=int, default=2)
+    lookup = sub.add_parser('lookup')
+    lookup.add_argument('index')
+    lookup.add_argument('title')
+    args = parser.parse_args()
+    if args.command == 'build':
+        count = build_index(args.source, args.index, args.sentences)
+        print(f"{datetime.now()} - {count} articles written to {args.index}")
+    else:
+        index = WikiIndex(args.index)
+        print(index.lookup(args.title) or "not found")
+
+if __name__ == "__main__":
+    main()